@@ -267,6 +267,21 @@ function domPath(el: HTMLElement): string {
   return `/${segments.join("/")}`;
 }
 
+// Checked in priority order: the earliest rule that matches anywhere in the text wins.
+const fieldRules: [string, string][] = [
+  ["email", "\\bemail\\b"],
+  ["phone", "\\b(?:phone|mobile|tel)\\b"],
+  ["password", "\\bpassword\\b"],
+  ["first_name", "\\b(?:first|given)\\s*name\\b"],
+  ["last_name", "\\b(?:last|family)\\s*name\\b"],
+  ["address", "\\b(?:address|street)\\b"],
+  ["city", "\\bcity\\b"],
+  ["state", "\\bstate\\b"],
+  ["zip", "\\bzip|postal\\b"],
+];
+// One alternation with a capture group per rule scans the text once instead of once per rule.
+const fieldPattern = new RegExp(fieldRules.map(([, pattern]) => `(${pattern})`).join("|"), "g");
+
 function classifyField(
   name: string | null,
   id: string | null,
@@ -278,17 +293,15 @@ function classifyField(
     .join(" ")
     .toLowerCase()
     .replace(/[^a-z0-9\s]/g, " ");
-  const has = (pattern: RegExp) => pattern.test(text);
-  if (has(/\bemail\b/)) return "email";
-  if (has(/\b(phone|mobile|tel)\b/)) return "phone";
-  if (has(/\bpassword\b/)) return "password";
-  if (has(/\b(first|given)\s*name\b/)) return "first_name";
-  if (has(/\b(last|family)\s*name\b/)) return "last_name";
-  if (has(/\b(address|street)\b/)) return "address";
-  if (has(/\bcity\b/)) return "city";
-  if (has(/\bstate\b/)) return "state";
-  if (has(/\bzip|postal\b/)) return "zip";
-  return "unknown";
+  let best = fieldRules.length;
+  for (const match of text.matchAll(fieldPattern)) {
+    const rule = match.findIndex((group, index) => index > 0 && group !== undefined) - 1;
+    if (rule < best) {
+      best = rule;
+      if (best === 0) break;
+    }
+  }
+  return best < fieldRules.length ? fieldRules[best][0] : "unknown";
 }
 
 function isVisible(el: HTMLElement): boolean {
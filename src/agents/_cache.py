@@ -0,0 +1,114 @@
+"""Exact-match response cache for deterministic Gemini calls."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path("data/llm_cache")
+DEFAULT_TTL_SECONDS = 86400
+LOGGER = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Two-tier (in-memory LRU + on-disk JSON) cache of LLM responses."""
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_memory_items: int = 256) -> None:
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for ``key`` or None when missing/expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry and entry[0] > now:
+                self._remember(key, entry)
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        entry = (time.time() + ttl, value)
+        with self._lock:
+            self._remember(key, entry)
+        path = self._path_for(key)
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per writer, so concurrent sets of one key never share it.
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as handle:
+                tmp_name = handle.name
+                json.dump({"expires_at": entry[0], "value": value}, handle, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            LOGGER.debug("Unable to persist LLM cache entry %s: %s", key, exc)
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, entry: tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[tuple[float, str]]:
+        path = self._path_for(key)
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            return float(raw["expires_at"]), str(raw["value"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+
+def make_cache_key(
+    model: str,
+    system_instruction: Optional[str],
+    prompt: str,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Hash the request inputs into a stable cache key."""
+    payload = json.dumps(
+        {"m": model, "s": system_instruction, "p": prompt, "r": response_schema},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the process-wide cache when ``GEMINI_CACHE=1``; otherwise None."""
+    if os.environ.get("GEMINI_CACHE") != "1":
+        return None
+    directory = Path(os.environ.get("GEMINI_CACHE_DIR", DEFAULT_CACHE_DIR))
+    return LLMCache(directory)
@@ -2,13 +2,81 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-import textwrap
-from typing import Any, Dict, Optional
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from .gemini import generate_gemini_content
+import orjson
+
+from .gemini import (
+    GeminiError,
+    agenerate_gemini_content,
+    generate_gemini_content,
+    generate_gemini_content_stream,
+)
+from .resume import load_resume_context
 
 DEFAULT_MODEL = "gemini-2.5-flash"
+LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_CONCURRENCY = 4
+OUTREACH_RESUME_MAX_TOKENS = 800
+# Words and standalone punctuation approximate subword token counts closely enough for budgeting.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_CTRL_TBL = dict.fromkeys(code for code in range(32) if code not in (9, 10, 13))
+
+# JSON schemas passed as response_schema so Gemini emits parseable output.
+FIT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number"},
+        "summary": {"type": "string"},
+    },
+    "required": ["score", "summary"],
+}
+
+OUTREACH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "email": {"type": "string"},
+        "linkedin": {"type": "string"},
+    },
+    "required": ["email", "linkedin"],
+}
+
+# Static prompt text is flush-left at module scope; builders join it with job/resume
+# fields in one pass so large resume/description strings are copied only once.
+_FIT_PROMPT_HEADER = (
+    "You are a meticulous career coach.\n"
+    "Compare the provided resume with the job details and respond with JSON in the form:\n"
+    '{"score": <0-1 float>, "summary": "3-4 sentence assessment"}.\n'
+    "Be honest. Do not fabricate skills.\n\n"
+    "Resume:\n"
+)
+
+_RESUME_PROMPT_HEADER = (
+    "You are an expert resume writer.\n"
+    "Rewrite the following resume to better target the job below.\n"
+    "Output the full resume text (plain text or Markdown) ready to copy-paste.\n"
+    "Tailor the resume for the specific job while keeping it to a single page, "
+    "preserving truthful experience, and avoiding exaggerated or new skills."
+)
+
+_OUTREACH_PROMPT_HEADER = (
+    "Craft concise, professional outreach for the job below.\n"
+    'Respond with JSON: {"email": "...", "linkedin": "..."}.\n'
+    "Email should be 3 short paragraphs max. "
+    "LinkedIn message should be friendly and < 500 characters.\n"
+    "Highlight genuine alignment; do not invent new skills. "
+    "Reference the resume only when relevant.\n"
+)
 
 
 def run_fit_analysis(
@@ -20,16 +88,49 @@ def run_fit_analysis(
 ) -> Dict[str, Any]:
     """Use Gemini to evaluate how well the resume matches the job."""
 
-    prompt = _build_fit_prompt(job, resume_text, instructions)
-    response = generate_gemini_content(prompt, model=model)
-    payload = _safe_json_loads(response)
-    summary = payload.get("summary") or payload.get("analysis") or response
-    score = payload.get("score")
-    try:
-        score = float(score) if score is not None else None
-    except (TypeError, ValueError):
-        score = None
-    return {"summary": summary.strip(), "score": score}
+    return run_fit_analysis_batch(
+        jobs=[job], resume_text=resume_text, instructions=instructions, model=model
+    )[0]
+
+
+def run_fit_analysis_batch(
+    *,
+    jobs: Sequence[Dict[str, Any]],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Evaluate resume fit for many jobs concurrently; results align with ``jobs``."""
+
+    unique_jobs, slots = _dedupe_jobs(jobs)
+    resume_block = _resume_context_block(resume_text, len(unique_jobs))
+    prompts = [_build_fit_prompt(job, resume_block, instructions) for job in unique_jobs]
+    responses = _generate_many(
+        prompts, model=model, max_concurrency=max_concurrency, response_schema=FIT_SCHEMA
+    )
+    return _broadcast([_parse_fit_response(response) for response in responses], slots)
+
+
+async def arun_fit_analysis_batch(
+    *,
+    jobs: Sequence[Dict[str, Any]],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    max_concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Async variant of ``run_fit_analysis_batch`` for use inside an event loop."""
+
+    unique_jobs, slots = _dedupe_jobs(jobs)
+    resume_block = await asyncio.to_thread(
+        _resume_context_block, resume_text, len(unique_jobs)
+    )
+    prompts = [_build_fit_prompt(job, resume_block, instructions) for job in unique_jobs]
+    responses = await _agenerate_many(
+        prompts, model=model, max_concurrency=max_concurrency, response_schema=FIT_SCHEMA
+    )
+    return _broadcast([_parse_fit_response(response) for response in responses], slots)
 
 
 def run_resume_tailoring(
@@ -41,9 +142,38 @@ def run_resume_tailoring(
 ) -> Dict[str, Any]:
     """Ask Gemini to tailor the resume text for the target job."""
 
+    return run_resume_tailoring_batch(
+        jobs=[job], resume_text=resume_text, instructions=instructions, model=model
+    )[0]
+
+
+def stream_resume_tailoring(
+    *,
+    job: Dict[str, Any],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+) -> Iterator[str]:
+    """Yield the tailored resume text progressively as Gemini generates it."""
+
     prompt = _build_resume_prompt(job, resume_text, instructions)
-    content = generate_gemini_content(prompt, model=model)
-    return {"content": content.strip()}
+    yield from generate_gemini_content_stream(prompt, model=model)
+
+
+def run_resume_tailoring_batch(
+    *,
+    jobs: Sequence[Dict[str, Any]],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Tailor the resume for many jobs concurrently; results align with ``jobs``."""
+
+    unique_jobs, slots = _dedupe_jobs(jobs)
+    prompts = [_build_resume_prompt(job, resume_text, instructions) for job in unique_jobs]
+    responses = _generate_many(prompts, model=model, max_concurrency=max_concurrency)
+    return _broadcast([{"content": content.strip()} for content in responses], slots)
 
 
 def run_outreach_generation(
@@ -55,8 +185,170 @@ def run_outreach_generation(
 ) -> Dict[str, Any]:
     """Produce outreach email + LinkedIn message using Gemini."""
 
+    return run_outreach_generation_batch(
+        jobs=[job], resume_text=resume_text, instructions=instructions, model=model
+    )[0]
+
+
+def stream_outreach_generation(
+    *,
+    job: Dict[str, Any],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+) -> Iterator[str]:
+    """Yield raw outreach JSON chunks; parse the joined text with ``_parse_outreach_response``."""
+
     prompt = _build_outreach_prompt(job, resume_text, instructions)
-    response = generate_gemini_content(prompt, model=model)
+    yield from generate_gemini_content_stream(
+        prompt, model=model, response_schema=OUTREACH_SCHEMA
+    )
+
+
+def run_outreach_generation_batch(
+    *,
+    jobs: Sequence[Dict[str, Any]],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Draft outreach for many jobs concurrently; results align with ``jobs``."""
+
+    unique_jobs, slots = _dedupe_jobs(jobs)
+    resume_block = _resume_context_block(resume_text, len(unique_jobs))
+    prompts = [_build_outreach_prompt(job, resume_block, instructions) for job in unique_jobs]
+    responses = _generate_many(
+        prompts, model=model, max_concurrency=max_concurrency, response_schema=OUTREACH_SCHEMA
+    )
+    return _broadcast([_parse_outreach_response(response) for response in responses], slots)
+
+
+async def arun_outreach_generation_batch(
+    *,
+    jobs: Sequence[Dict[str, Any]],
+    resume_text: str,
+    instructions: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    max_concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Async variant of ``run_outreach_generation_batch`` for use inside an event loop."""
+
+    unique_jobs, slots = _dedupe_jobs(jobs)
+    resume_block = await asyncio.to_thread(
+        _resume_context_block, resume_text, len(unique_jobs)
+    )
+    prompts = [_build_outreach_prompt(job, resume_block, instructions) for job in unique_jobs]
+    responses = await _agenerate_many(
+        prompts, model=model, max_concurrency=max_concurrency, response_schema=OUTREACH_SCHEMA
+    )
+    return _broadcast([_parse_outreach_response(response) for response in responses], slots)
+
+
+def _resume_context_block(resume_text: str, job_count: int) -> str:
+    """Compact JSON resume summary for per-job prompts; full text if unavailable.
+
+    The summary costs a Gemini call of its own, so it is only used when several
+    prompts in one batch share it; a single job keeps the full resume text.
+    """
+
+    if job_count < 2:
+        return resume_text
+    try:
+        context = load_resume_context(resume_text)
+    except GeminiError as exc:
+        LOGGER.warning("Falling back to full resume text in prompt: %s", exc)
+        return resume_text
+    return orjson.dumps(context).decode("utf-8")
+
+
+def _dedupe_jobs(
+    jobs: Sequence[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Collapse jobs with identical normalized content.
+
+    Returns the unique jobs plus, for each input job, the index of its unique
+    representative so results can be broadcast back in input order.
+    """
+
+    unique_jobs: List[Dict[str, Any]] = []
+    slots: List[int] = []
+    seen: Dict[str, int] = {}
+    for job in jobs:
+        key = _job_content_key(job)
+        if key not in seen:
+            seen[key] = len(unique_jobs)
+            unique_jobs.append(job)
+        slots.append(seen[key])
+    return unique_jobs, slots
+
+
+def _job_content_key(job: Dict[str, Any]) -> str:
+    raw = f"{job.get('title', '')}|{job.get('company', '')}|{job.get('description', '')}"
+    normalized = _WHITESPACE_RE.sub(" ", raw.lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _broadcast(results: Sequence[Dict[str, Any]], slots: Sequence[int]) -> List[Dict[str, Any]]:
+    # Copy so callers mutating one job's result don't affect its duplicates.
+    return [dict(results[slot]) for slot in slots]
+
+
+def _generate_many(
+    prompts: Sequence[str],
+    *,
+    model: str,
+    max_concurrency: int,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Fan prompts out to Gemini with bounded concurrency, preserving order."""
+
+    def generate(prompt: str) -> str:
+        return generate_gemini_content(prompt, model=model, response_schema=response_schema)
+
+    if not prompts:
+        return []
+    if len(prompts) == 1:
+        return [generate(prompts[0])]
+
+    workers = max(1, min(max_concurrency, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(generate, prompts))
+
+
+async def _agenerate_many(
+    prompts: Sequence[str],
+    *,
+    model: str,
+    max_concurrency: Optional[int] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Gather async Gemini calls under a semaphore to respect provider rate limits."""
+
+    limit = max_concurrency or int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def generate(prompt: str) -> str:
+        async with semaphore:
+            return await agenerate_gemini_content(
+                prompt, model=model, response_schema=response_schema
+            )
+
+    return list(await asyncio.gather(*(generate(prompt) for prompt in prompts)))
+
+
+def _parse_fit_response(response: str) -> Dict[str, Any]:
+    payload = _safe_json_loads(response)
+    summary = payload.get("summary") or payload.get("analysis") or response
+    score = payload.get("score")
+    try:
+        score = float(score) if score is not None else None
+    except (TypeError, ValueError):
+        score = None
+    return {"summary": summary.strip(), "score": score}
+
+
+def _parse_outreach_response(response: str) -> Dict[str, Any]:
     payload = _safe_json_loads(response)
     email_raw = payload.get("email") or payload.get("email_text")
     linkedin_raw = payload.get("linkedin") or payload.get("linkedin_message")
@@ -72,101 +364,118 @@ def run_outreach_generation(
 def _build_fit_prompt(
     job: Dict[str, Any], resume_text: str, instructions: Optional[str]
 ) -> str:
-    details = textwrap.dedent(
-        f"""
-        Job Title: {job['title']}
-        Company: {job['company']}
-        Description:\n{job['description']}
-        Existing Vector Score: {job.get('score')}
-        Existing LLM Score: {job.get('llm_refined_score')}
-        """
-    ).strip()
-    guidance = "Evaluate how well the resume fits the job (0-1)."
+    parts = [
+        _FIT_PROMPT_HEADER,
+        resume_text,
+        "\n\nJob Details:\nJob Title: ",
+        str(job["title"]),
+        "\nCompany: ",
+        str(job["company"]),
+        "\nDescription:\n",
+        str(job["description"]),
+        "\nExisting Vector Score: ",
+        str(job.get("score")),
+        "\nExisting LLM Score: ",
+        str(job.get("llm_refined_score")),
+        "\n\nEvaluate how well the resume fits the job (0-1).",
+    ]
     if instructions:
-        guidance += f"\nUser instructions: {instructions.strip()}"
-    return textwrap.dedent(
-        f"""
-        You are a meticulous career coach.
-        Compare the provided resume with the job details and respond with JSON in the form:
-        {{"score": <0-1 float>, "summary": "3-4 sentence assessment"}}.
-        Be honest. Do not fabricate skills.
-
-        Resume:\n{resume_text}
-
-        Job Details:\n{details}
-
-        {guidance}
-        """
-    ).strip()
+        parts.extend(("\nUser instructions: ", instructions.strip()))
+    return "".join(parts)
 
 
 def _build_resume_prompt(
     job: Dict[str, Any], resume_text: str, instructions: Optional[str]
 ) -> str:
-    base_rules = (
-        "Tailor the resume for the specific job while keeping it to a single page, "
-        "preserving truthful experience, and avoiding exaggerated or new skills."
+    parts = [_RESUME_PROMPT_HEADER]
+    if instructions:
+        parts.extend(("\nCustom instructions: ", instructions.strip()))
+    parts.extend(
+        (
+            "\n\nCurrent Resume:\n",
+            resume_text,
+            "\n\nTarget Job:\nTitle: ",
+            str(job["title"]),
+            "\nCompany: ",
+            str(job["company"]),
+            "\nDescription:\n",
+            str(job["description"]),
+        )
     )
-    extra = f"\nCustom instructions: {instructions.strip()}" if instructions else ""
-    return textwrap.dedent(
-        f"""
-        You are an expert resume writer.
-        Rewrite the following resume to better target the job below.
-        Output the full resume text (plain text or Markdown) ready to copy-paste.
-        {base_rules}{extra}
-
-        Current Resume:\n{resume_text}
-
-        Target Job:\nTitle: {job['title']}
-Company: {job['company']}
-Description:\n{job['description']}
-        """
-    ).strip()
+    return "".join(parts)
 
 
 def _build_outreach_prompt(
     job: Dict[str, Any], resume_text: str, instructions: Optional[str]
 ) -> str:
-    extra = f"\nCustom instructions: {instructions.strip()}" if instructions else ""
-    recruiter_line = (
-        f"You may reference recruiter profile: {job['recruiter_url']}."
-        if job.get("recruiter_url")
-        else ""
+    parts = [_OUTREACH_PROMPT_HEADER]
+    if job.get("recruiter_url"):
+        parts.extend(("You may reference recruiter profile: ", job["recruiter_url"], "."))
+    if instructions:
+        parts.extend(("\nCustom instructions: ", instructions.strip()))
+    parts.extend(
+        (
+            "\n\nResume Summary:\n",
+            _truncate_to_tokens(resume_text, OUTREACH_RESUME_MAX_TOKENS),
+            "\n\nJob Details:\nTitle: ",
+            str(job["title"]),
+            "\nCompany: ",
+            str(job["company"]),
+            "\nDescription:\n",
+            str(job["description"]),
+        )
     )
-    return textwrap.dedent(
-        f"""
-        Craft concise, professional outreach for the job below.
-        Respond with JSON: {{"email": "...", "linkedin": "..."}}.
-        Email should be 3 short paragraphs max. LinkedIn message should be friendly and < 500 characters.
-        Highlight genuine alignment; do not invent new skills. Reference the resume only when relevant.
-        {recruiter_line}{extra}
+    return "".join(parts)
 
-        Resume Summary:\n{resume_text[:2000]}
 
-        Job Details:\nTitle: {job['title']}
-Company: {job['company']}
-Description:\n{job['description']}
-        """
-    ).strip()
+@lru_cache(maxsize=8)
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` after roughly ``max_tokens`` tokens, keeping original formatting.
+
+    Cached because the master resume is the same string across every outreach call.
+    """
+    end = None
+    for count, match in enumerate(_TOKEN_RE.finditer(text), start=1):
+        if count == max_tokens:
+            end = match.end()
+            break
+    return text if end is None else text[:end]
 
 
 def _safe_json_loads(payload: str) -> Dict[str, Any]:
-    payload = payload.strip()
     if not payload:
         return {}
+    text = payload
+    # Structured-output responses are bare objects; only strip when they are not.
+    if text[0] != "{" or text[-1] != "}":
+        text = text.strip()
+        if not text:
+            return {}
+    if text[0] == "{" and text[-1] == "}":
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    # Attempt to locate the outermost JSON object in a single scan
+    match = _JSON_OBJECT_RE.search(text)
+    if not match:
+        return {"summary": text}
+    snippet = _normalize_json(match.group(0))
     try:
-        return json.loads(payload)
+        return orjson.loads(snippet)
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        # Raw newlines/tabs inside strings are invalid JSON but common in LLM output.
+        return json.loads(snippet, strict=False)
     except json.JSONDecodeError:
-        # Attempt to locate JSON substring
-        start = payload.find("{")
-        end = payload.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            snippet = payload[start : end + 1]
-            try:
-                return json.loads(snippet)
-            except json.JSONDecodeError:
-                return {"summary": payload}
-        return {"summary": payload}
+        return {"summary": text}
+
+
+def _normalize_json(snippet: str) -> str:
+    """Drop control characters (other than whitespace) that break JSON decoding."""
+    return snippet.translate(_CTRL_TBL)
 
 
 def _coerce_to_text(value: Any) -> str:
@@ -2,9 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import random
+import re
+import time
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
+
+from ._cache import get_llm_cache, make_cache_key
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 30.0
+_RETRYABLE_CODES = {429, 500, 503}
+_RETRYABLE_STATUSES = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "INTERNAL")
+# Whole tokens only, so ids or limits such as "5000 tokens" are not read as a status.
+_RETRYABLE_MESSAGE_RE = re.compile(
+    r"\b(?:%s)\b" % "|".join([*map(str, sorted(_RETRYABLE_CODES)), *_RETRYABLE_STATUSES])
+)
 
 
 class GeminiError(RuntimeError):
@@ -27,23 +44,194 @@ def _load_client():
     return genai.Client(api_key=api_key)
 
 
+def _max_retries() -> int:
+    try:
+        return max(1, int(os.environ.get("GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES)))
+    except ValueError:
+        return DEFAULT_MAX_RETRIES
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for throttling / transient server errors worth retrying."""
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code in _RETRYABLE_CODES
+    status = getattr(exc, "status", None)
+    if isinstance(status, str):
+        return status in _RETRYABLE_STATUSES
+    # Errors without structured fields (e.g. wrapped transport errors) fall back to text.
+    return bool(_RETRYABLE_MESSAGE_RE.search(str(exc)))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Jittered exponential backoff capped at ``MAX_BACKOFF_SECONDS``."""
+    return min(MAX_BACKOFF_SECONDS, (2**attempt) + random.random())
+
+
+def _build_config(response_schema: Optional[Dict[str, Any]]):
+    """Return a GenerateContentConfig requesting JSON output, or None."""
+    if response_schema is None:
+        return None
+    from google.genai import types  # type: ignore
+
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=response_schema,
+    )
+
+
 def generate_gemini_content(
     prompt: str,
     *,
     model: str = "gemini-2.5-flash",
     system_instruction: Optional[str] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
 ) -> str:
-    """Send a single prompt to Gemini and return the text response."""
+    """Send a single prompt to Gemini and return the text response.
+
+    When ``response_schema`` is given Gemini is constrained to emit JSON matching
+    it. When ``GEMINI_CACHE=1`` identical requests are served from the local
+    response cache. Throttling and transient server errors are retried with
+    jittered exponential backoff up to ``GEMINI_MAX_RETRIES`` attempts (default 5).
+    """
+
+    cache = get_llm_cache()
+    cache_key = (
+        make_cache_key(model, system_instruction, prompt, response_schema) if cache else None
+    )
+    if cache and cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
     client = _load_client()
     contents = prompt if not system_instruction else f"{system_instruction}\n\n{prompt}"
 
-    try:
-        response = client.models.generate_content(model=model, contents=contents)
-    except Exception as exc:  # pragma: no cover - upstream SDK errors
-        raise GeminiError(f"Gemini request failed: {exc}") from exc
+    config = _build_config(response_schema)
+    max_retries = _max_retries()
+    for attempt in range(max_retries):
+        try:
+            response = client.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+            break
+        except Exception as exc:  # pragma: no cover - upstream SDK errors
+            if attempt + 1 >= max_retries or not _is_retryable(exc):
+                raise GeminiError(f"Gemini request failed: {exc}") from exc
+            delay = _backoff_delay(attempt)
+            LOGGER.warning("Gemini request throttled (%s); retrying in %.1fs", exc, delay)
+            time.sleep(delay)
+
+    text = getattr(response, "text", None)
+    if not text:
+        raise GeminiError("Gemini returned an empty response.")
+    text = text.strip()
+    if cache and cache_key:
+        cache.set(cache_key, text)
+    return text
+
+
+async def agenerate_gemini_content(
+    prompt: str,
+    *,
+    model: str = "gemini-2.5-flash",
+    system_instruction: Optional[str] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Async counterpart of ``generate_gemini_content``.
+
+    Uses the cached client's ``aio`` surface so concurrent calls share one
+    connection pool instead of paying a TLS handshake each.
+    """
+
+    cache = get_llm_cache()
+    cache_key = (
+        make_cache_key(model, system_instruction, prompt, response_schema) if cache else None
+    )
+    if cache and cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    client = _load_client()
+    contents = prompt if not system_instruction else f"{system_instruction}\n\n{prompt}"
+
+    config = _build_config(response_schema)
+    max_retries = _max_retries()
+    for attempt in range(max_retries):
+        try:
+            response = await client.aio.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+            break
+        except Exception as exc:  # pragma: no cover - upstream SDK errors
+            if attempt + 1 >= max_retries or not _is_retryable(exc):
+                raise GeminiError(f"Gemini request failed: {exc}") from exc
+            delay = _backoff_delay(attempt)
+            LOGGER.warning("Gemini request throttled (%s); retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
 
     text = getattr(response, "text", None)
     if not text:
         raise GeminiError("Gemini returned an empty response.")
-    return text.strip()
+    text = text.strip()
+    if cache and cache_key:
+        cache.set(cache_key, text)
+    return text
+
+
+def generate_gemini_content_stream(
+    prompt: str,
+    *,
+    model: str = "gemini-2.5-flash",
+    system_instruction: Optional[str] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> Iterator[str]:
+    """Stream a Gemini response, yielding text chunks as they arrive.
+
+    Closing the generator early stops consuming the upstream stream, so callers
+    can abort once they have seen enough output. Only fully consumed streams are
+    written to the response cache.
+    """
+
+    cache = get_llm_cache()
+    cache_key = (
+        make_cache_key(model, system_instruction, prompt, response_schema) if cache else None
+    )
+    if cache and cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    client = _load_client()
+    contents = prompt if not system_instruction else f"{system_instruction}\n\n{prompt}"
+
+    config = _build_config(response_schema)
+    max_retries = _max_retries()
+    received = []
+    for attempt in range(max_retries):
+        try:
+            response = client.models.generate_content_stream(
+                model=model, contents=contents, config=config
+            )
+            for chunk in response:
+                text = getattr(chunk, "text", None)
+                if text:
+                    received.append(text)
+                    yield text
+            break
+        except GeminiError:
+            raise
+        except Exception as exc:  # pragma: no cover - upstream SDK errors
+            # Once text has been yielded a retry would duplicate it downstream.
+            if received or attempt + 1 >= max_retries or not _is_retryable(exc):
+                raise GeminiError(f"Gemini request failed: {exc}") from exc
+            delay = _backoff_delay(attempt)
+            LOGGER.warning("Gemini stream throttled (%s); retrying in %.1fs", exc, delay)
+            time.sleep(delay)
+
+    if not received:
+        raise GeminiError("Gemini returned an empty response.")
+    if cache and cache_key:
+        cache.set(cache_key, "".join(received).strip())
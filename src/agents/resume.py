@@ -2,18 +2,60 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from PyPDF2 import PdfReader
+import orjson
+import pypdfium2 as pdfium
+
+from .gemini import GeminiError, generate_gemini_content
 
 DEFAULT_RESUME_PATH = Path("data/resume.pdf")
+TEXT_CACHE_DIR = Path.home() / ".cache" / "ai-job-assistant"
+CONTEXT_CACHE_DIR = TEXT_CACHE_DIR / "resume-context"
+LOGGER = logging.getLogger(__name__)
+RESUME_CONTEXT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "role": {"type": "string"},
+                    "years": {"type": "integer"},
+                    "impact": {"type": "string"},
+                },
+                "required": ["role", "impact"],
+            },
+        },
+    },
+    "required": ["summary", "skills", "experience"],
+}
+_RESUME_CONTEXT_PROMPT = (
+    "Summarize the resume below for a recruiter-matching system. Return a 2-3 sentence "
+    "summary, the full list of concrete skills, and each role with approximate years and "
+    "its single most significant impact. Use only facts stated in the resume.\n\nResume:\n"
+)
+# Below this page count, spawning workers costs more than the extraction itself.
+PARALLEL_EXTRACT_MIN_PAGES = 8
 
 
 @lru_cache(maxsize=1)
 def load_master_resume_text(resume_path: Optional[Path] = None) -> str:
-    """Load the text content from the master resume PDF."""
+    """Load the text content from the master resume PDF.
+
+    Extracted text is also cached on disk keyed by (path, mtime, size) so fresh CLI
+    processes skip PDF parsing; set ``RESUME_TEXT_CACHE=0`` to disable.
+    """
 
     path = resume_path or DEFAULT_RESUME_PATH
     if not path.exists():
@@ -21,9 +63,130 @@ def load_master_resume_text(resume_path: Optional[Path] = None) -> str:
             f"Master resume not found at {path}. Ensure data/resume.pdf exists."
         )
 
-    reader = PdfReader(path)
-    pages = [page.extract_text() or "" for page in reader.pages]
+    cache_path = _text_cache_path(path)
+    if cache_path is not None:
+        try:
+            return cache_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            LOGGER.debug("Unable to read resume text cache %s: %s", cache_path, exc)
+
+    pages: Optional[List[str]] = None
+    pdf = pdfium.PdfDocument(path)
+    try:
+        page_count = len(pdf)
+        if page_count < PARALLEL_EXTRACT_MIN_PAGES:
+            pages = [_page_text(pdf, index) for index in range(page_count)]
+    finally:
+        pdf.close()
+    if pages is None:
+        pages = _extract_pages_concurrently(path, page_count)
+
     combined = "\n".join(pages).strip()
     if not combined:
         raise ValueError("Unable to extract text from resume PDF.")
+    if cache_path is not None:
+        try:
+            _write_atomic(cache_path, combined.encode("utf-8"))
+        except OSError as exc:
+            LOGGER.debug("Unable to write resume text cache %s: %s", cache_path, exc)
     return combined
+
+
+@lru_cache(maxsize=4)
+def load_resume_context(resume_text: str) -> Dict[str, Any]:
+    """Return a compact structured summary (skills, roles, impact) of the resume.
+
+    Generated with one Gemini call per distinct resume text and cached on disk, so
+    per-job prompts can carry a few hundred tokens instead of the full resume; set
+    ``RESUME_CONTEXT_CACHE=0`` to disable the disk cache. Raises GeminiError if the
+    summary cannot be produced.
+    """
+
+    digest = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    cache_path = None
+    if os.environ.get("RESUME_CONTEXT_CACHE", "1") != "0":
+        cache_path = CONTEXT_CACHE_DIR / f"{digest}.json"
+    if cache_path is not None:
+        try:
+            cached = orjson.loads(cache_path.read_bytes())
+        except FileNotFoundError:
+            cached = None
+        except (OSError, orjson.JSONDecodeError) as exc:
+            LOGGER.debug("Ignoring unreadable resume context cache %s: %s", cache_path, exc)
+            cached = None
+        if isinstance(cached, dict):
+            return cached
+
+    response = generate_gemini_content(
+        _RESUME_CONTEXT_PROMPT + resume_text, response_schema=RESUME_CONTEXT_SCHEMA
+    )
+    try:
+        context = orjson.loads(response)
+    except orjson.JSONDecodeError as exc:
+        raise GeminiError("Gemini returned an invalid resume summary.") from exc
+    if not isinstance(context, dict):
+        raise GeminiError("Gemini returned an invalid resume summary.")
+
+    if cache_path is not None:
+        try:
+            _write_atomic(cache_path, orjson.dumps(context))
+        except OSError as exc:
+            LOGGER.debug("Unable to write resume context cache %s: %s", cache_path, exc)
+    return context
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a unique temp file and ``os.replace`` so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as handle:
+            tmp_name = handle.name
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except OSError:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        raise
+
+
+def _text_cache_path(path: Path) -> Optional[Path]:
+    """Return the on-disk text cache location for this exact file revision."""
+    if os.environ.get("RESUME_TEXT_CACHE", "1") == "0":
+        return None
+    stat = path.stat()
+    fingerprint = f"{path.resolve()}-{stat.st_mtime_ns}-{stat.st_size}"
+    digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+    return TEXT_CACHE_DIR / f"resume-{digest}.txt"
+
+
+def _page_text(pdf: "pdfium.PdfDocument", index: int) -> str:
+    return pdf[index].get_textpage().get_text_range() or ""
+
+
+def _extract_page_range(path: str, indices: Sequence[int]) -> List[str]:
+    """Worker: open the PDF independently and extract the given pages."""
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return [_page_text(pdf, index) for index in indices]
+    finally:
+        pdf.close()
+
+
+def _extract_pages_concurrently(path: Path, page_count: int) -> List[str]:
+    """Split pages across processes; PDFium is not thread-safe, so threads won't do."""
+    workers = max(1, min(page_count, os.cpu_count() or 1))
+    chunks = [list(range(start, page_count, workers)) for start in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_extract_page_range, [str(path)] * workers, chunks))
+
+    pages = [""] * page_count
+    for indices, texts in zip(chunks, results):
+        for index, text in zip(indices, texts):
+            pages[index] = text
+    return pages
@@ -4,57 +4,211 @@ from __future__ import annotations
 
 import re
 import logging
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from PyPDF2 import PdfReader
+import orjson
+import pypdfium2 as pdfium
 
-from .gemini import generate_gemini_content
+from .gemini import generate_gemini_content, generate_gemini_content_stream
 from ..tools.render_resume import render_resume
 
 MAX_ITERATIONS = 5
+# Once a draft compiles only page overflow remains, which targeted shrinking fixes quickly.
+MAX_SHRINK_ITERATIONS = 3
+MIN_SHRINK_RATIO = 0.15
+DOCUMENT_END = r"\end{document}"
 VERSIONS_DIR = Path("data/versions")
 LOGGER = logging.getLogger(__name__)
+EDITS_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "find": {"type": "string"},
+            "replace": {"type": "string"},
+        },
+        "required": ["find", "replace"],
+    },
+}
+_FENCE_RE = re.compile(r"```(?:tex|latex)?\s*(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
 
 
 def _extract_code_block(text: str) -> str:
-    """Strip fences and return raw TeX."""
-    fenced = re.search(r"```(?:tex|latex)?\s*(.*?)```", text, re.DOTALL | re.IGNORECASE)
+    """Strip fences (closed or truncated) and return raw TeX."""
+    fenced = _FENCE_RE.search(text)
     if fenced:
         return fenced.group(1).strip()
     return text.strip()
 
 
 def _build_tailor_prompt(
-    job: Dict[str, Any], base_tex: str, instructions: Optional[str], feedback: Optional[str]
+    job: Dict[str, Any],
+    base_tex: str,
+    instructions: Optional[str],
+    feedback: Optional[str],
+    *,
+    edit_mode: bool = False,
 ) -> str:
+    """Build the tailoring prompt; ``edit_mode`` asks for find/replace edits only."""
+    output_rule = (
+        'Respond with a JSON list of edits: [{"find": "...", "replace": "..."}, ...]. '
+        "Each find must be an exact substring of the current LaTeX. Do not repeat the full document."
+        if edit_mode
+        else "Return the full modified LaTeX document only (no commentary)."
+    )
     constraint_lines = [
         "Keep the LaTeX structure and macros exactly as-is. Do not add packages or change class/structure.",
         "Do not invent new facts, skills, roles, or dates. Only rephrase or reorder existing content.",
         "Target a single page; shorten text as needed while preserving truthfulness.",
-        "Return the full modified LaTeX document only (no commentary).",
+        output_rule,
     ]
     if feedback:
         constraint_lines.append(f"Additional adjustments: {feedback}")
-    base_guidance = "\n".join(f"- {line}" for line in constraint_lines)
-    job_block = f"Title: {job['title']}\nCompany: {job['company']}\nDescription:\n{job['description']}"
+    parts = [
+        "You are tailoring a resume by editing LaTeX content only.\n\n",
+        "Job details:\nTitle: ",
+        str(job["title"]),
+        "\nCompany: ",
+        str(job["company"]),
+        "\nDescription:\n",
+        str(job["description"]),
+        "\n\nConstraints:\n",
+        "\n".join(f"- {line}" for line in constraint_lines),
+        "\n",
+    ]
     user_instructions = instructions.strip() if instructions else ""
-    prompt = (
-        "You are tailoring a resume by editing LaTeX content only.\n\n"
-        f"Job details:\n{job_block}\n\n"
-        f"Constraints:\n{base_guidance}\n"
-    )
     if user_instructions:
-        prompt += f"\nUser instructions:\n{user_instructions}\n"
-    prompt += "\nHere is the current LaTeX. Return the full modified LaTeX:\n"
-    prompt += base_tex
-    return prompt
+        parts.extend(("\nUser instructions:\n", user_instructions, "\n"))
+    if edit_mode:
+        parts.append("\nHere is the current LaTeX. Return the JSON list of edits:\n")
+    else:
+        parts.append("\nHere is the current LaTeX. Return the full modified LaTeX:\n")
+    parts.append(base_tex)
+    return "".join(parts)
+
+
+def _apply_edits(tex: str, edits: Any) -> Optional[str]:
+    """Apply find/replace edits in order; None if any edit does not apply cleanly."""
+    if not isinstance(edits, list) or not edits:
+        return None
+    for edit in edits:
+        if not isinstance(edit, dict):
+            return None
+        find = edit.get("find")
+        replace = edit.get("replace")
+        if not isinstance(find, str) or not find or not isinstance(replace, str):
+            return None
+        if find not in tex:
+            return None
+        tex = tex.replace(find, replace, 1)
+    return tex
+
+
+def _shrink_candidate(
+    job: Dict[str, Any],
+    current_tex: str,
+    instructions: Optional[str],
+    feedback: str,
+    model: Optional[str],
+) -> str:
+    """Shrink an overflowing draft via an edit list, falling back to a full rewrite.
+
+    Only the changed snippets are generated, which keeps output tokens proportional
+    to the edit rather than to the whole document.
+    """
+    edit_prompt = _build_tailor_prompt(job, current_tex, instructions, feedback, edit_mode=True)
+    model_kwargs = {"model": model} if model else {}
+    try:
+        response = generate_gemini_content(
+            edit_prompt, response_schema=EDITS_SCHEMA, **model_kwargs
+        )
+        edited = _apply_edits(current_tex, orjson.loads(response))
+    except orjson.JSONDecodeError:
+        edited = None
+    if edited is not None:
+        return edited
+
+    LOGGER.debug("Edit-list shrink did not apply cleanly; requesting full document.")
+    prompt = _build_tailor_prompt(job, current_tex, instructions, feedback)
+    return _extract_code_block(_generate_tex(prompt, model))
+
+
+def _generate_tex(prompt: str, model: Optional[str]) -> str:
+    """Stream the LaTeX response and stop as soon as the document is closed."""
+    stream = (
+        generate_gemini_content_stream(prompt, model=model)
+        if model
+        else generate_gemini_content_stream(prompt)
+    )
+    received = []
+    tail = ""
+    try:
+        for chunk in stream:
+            received.append(chunk)
+            # Only rescan the seam between chunks so long documents stay linear.
+            window = tail + chunk
+            marker = window.find(DOCUMENT_END)
+            if marker != -1:
+                overshoot = len(window) - (marker + len(DOCUMENT_END))
+                text = "".join(received)
+                return text[: len(text) - overshoot]
+            tail = window[-len(DOCUMENT_END) :]
+    finally:
+        stream.close()
+    return "".join(received)
+
+
+def _shrink_feedback(page_count: int, candidate_tex: str) -> str:
+    """Ask for a concrete character budget proportional to the page overshoot."""
+    target_shrink = max(MIN_SHRINK_RATIO, 1.0 - 1.0 / page_count)
+    current_chars = len(candidate_tex)
+    target_chars = int(current_chars / page_count)
+    return (
+        f"Current PDF is {page_count} pages. You must remove approximately "
+        f"{int(target_shrink * 100)}% of the bullet characters (currently {current_chars} chars, "
+        f"target {target_chars} chars) without adding facts. Prioritize dropping the least "
+        "job-relevant bullets entirely rather than trimming each, and keep structure identical."
+    )
 
 
 def _count_pages(pdf_path: Path) -> int:
-    reader = PdfReader(pdf_path)
-    return len(reader.pages)
+    # Page count only needs the xref/page tree, not the content streams.
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _discard_in_background(stale_paths: List[Tuple[Path, Path]]) -> None:
+    """Unlink superseded drafts on a daemon thread so returning isn't blocked on I/O."""
+    if not stale_paths:
+        return
+
+    def _unlink_all() -> None:
+        for pair in stale_paths:
+            for path in pair:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    LOGGER.debug("Unable to remove stale draft %s", path)
+
+    threading.Thread(target=_unlink_all, name="tailor-cleanup", daemon=True).start()
+
+
+def _render_and_count(tex_path: Path, class_path: Path, pdf_path: Path) -> int:
+    rendered_pdf = render_resume(
+        tex_path=tex_path,
+        cls_path=class_path,
+        output_pdf=pdf_path,
+        keep_aux=False,
+    )
+    return _count_pages(rendered_pdf)
 
 
 def tailor_resume_agentic(
@@ -64,14 +218,27 @@ def tailor_resume_agentic(
     class_path: Path,
     instructions: Optional[str],
     model: Optional[str] = None,
+    speculate: bool = True,
 ) -> Dict[str, Any]:
-    """Iteratively tailor the resume LaTeX and enforce one-page PDF."""
+    """Iteratively tailor the resume LaTeX and enforce one-page PDF.
+
+    With ``speculate`` enabled, once a draft has overflowed, a shrink request for
+    each following candidate is sent to Gemini while that candidate compiles. It
+    assumes the previous page count; the result is used directly if the PDF overflows
+    by exactly that much and discarded otherwise, hiding compile latency behind
+    generation. Drafts that have not overflowed yet never pay for a speculative call.
+    """
     if not master_tex_path.exists():
         raise FileNotFoundError(f"Master resume not found at {master_tex_path}")
     if not class_path.exists():
         raise FileNotFoundError(f"Class file not found at {class_path}")
 
     base_tex = master_tex_path.read_text(encoding="utf-8")
+    # Stage the class next to the drafts once so each compile skips the copy/unlink dance.
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    staged_class_path = VERSIONS_DIR / class_path.name
+    if staged_class_path.resolve() != class_path.resolve():
+        shutil.copy2(class_path, staged_class_path)
     feedback: Optional[str] = None
     attempt_tex = base_tex
     page_count = None
@@ -79,63 +246,97 @@ def tailor_resume_agentic(
     last_error: Optional[str] = None
 
     stale_paths = []
+    iteration_limit = MAX_ITERATIONS
+    iteration = 0
+    shrinking = False
+    pending_candidate: Optional[Future] = None
+    pool = ThreadPoolExecutor(max_workers=2)
 
-    for _ in range(MAX_ITERATIONS):
-        prompt = _build_tailor_prompt(job, attempt_tex, instructions, feedback)
-        response = generate_gemini_content(prompt, model=model) if model else generate_gemini_content(prompt)
-        candidate_tex = _extract_code_block(response)
-
-        VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
-        temp_id = uuid4().hex
-        temp_tex_path = VERSIONS_DIR / f"{temp_id}.tex"
-        temp_pdf_path = VERSIONS_DIR / f"{temp_id}.pdf"
-        temp_tex_path.write_text(candidate_tex, encoding="utf-8")
-
-        try:
-            rendered_pdf = render_resume(
-                tex_path=temp_tex_path,
-                cls_path=class_path,
-                output_pdf=temp_pdf_path,
-                keep_aux=False,
-            )
-            page_count = _count_pages(rendered_pdf)
-        except Exception as exc:  # capture compile errors and retry
-            last_error = str(exc)
-            feedback = (
-                "The previous LaTeX failed to compile. Fix the LaTeX syntax without changing structure "
-                "or adding packages. Do not use alignment tabs (&) unless inside proper tables. "
-                f"Compiler message: {last_error[:500]}"
+    try:
+        while iteration < iteration_limit:
+            iteration += 1
+            if pending_candidate is not None:
+                candidate_tex = pending_candidate.result()
+                pending_candidate = None
+            elif shrinking:
+                candidate_tex = _shrink_candidate(job, attempt_tex, instructions, feedback, model)
+            else:
+                # Initial drafts and compile fixes may need structural changes: full rewrite.
+                prompt = _build_tailor_prompt(job, attempt_tex, instructions, feedback)
+                candidate_tex = _extract_code_block(_generate_tex(prompt, model))
+
+            temp_id = uuid4().hex
+            temp_tex_path = VERSIONS_DIR / f"{temp_id}.tex"
+            temp_pdf_path = VERSIONS_DIR / f"{temp_id}.pdf"
+            temp_tex_path.write_text(candidate_tex, encoding="utf-8")
+
+            compile_future = pool.submit(
+                _render_and_count, temp_tex_path, staged_class_path, temp_pdf_path
             )
+            speculative: Optional[Future] = None
+            # Only a shrink of an overflowing draft is likely to overflow again. Its real
+            # page count is not known yet, so the request assumes the previous one.
+            assumed_pages = page_count
+            if speculate and shrinking and iteration < iteration_limit:
+                speculative = pool.submit(
+                    _shrink_candidate,
+                    job,
+                    candidate_tex,
+                    instructions,
+                    _shrink_feedback(assumed_pages, candidate_tex),
+                    model,
+                )
+
+            try:
+                page_count = compile_future.result()
+                last_error = None
+                iteration_limit = min(
+                    iteration_limit, max(MAX_SHRINK_ITERATIONS, iteration + 1)
+                )
+            except Exception as exc:  # capture compile errors and retry
+                if speculative is not None:
+                    speculative.cancel()
+                last_error = str(exc)
+                feedback = (
+                    "The previous LaTeX failed to compile. Fix the LaTeX syntax without changing structure "
+                    "or adding packages. Do not use alignment tabs (&) unless inside proper tables. "
+                    f"Compiler message: {last_error[:500]}"
+                )
+                shrinking = False
+                attempt_tex = candidate_tex
+                stale_paths.append((temp_tex_path, temp_pdf_path))
+                LOGGER.debug("Tailor compile failed: %s", last_error)
+                continue
+
+            if page_count <= 1:
+                if speculative is not None:
+                    speculative.cancel()
+                status = "success"
+                version_id = temp_id
+                _discard_in_background(stale_paths)
+                return {
+                    "version_id": version_id,
+                    "tex_path": temp_tex_path,
+                    "pdf_path": temp_pdf_path,
+                    "page_count": page_count,
+                    "status": status,
+                }
+
+            feedback = _shrink_feedback(page_count, candidate_tex)
+            shrinking = True
             attempt_tex = candidate_tex
             stale_paths.append((temp_tex_path, temp_pdf_path))
-            LOGGER.debug("Tailor compile failed: %s", last_error)
-            continue
-
-        if page_count <= 1:
-            status = "success"
-            version_id = temp_id
-            for old_tex, old_pdf in stale_paths:
-                for path in (old_tex, old_pdf):
-                    try:
-                        path.unlink()
-                    except OSError:
-                        continue
-            return {
-                "version_id": version_id,
-                "tex_path": temp_tex_path,
-                "pdf_path": temp_pdf_path,
-                "page_count": page_count,
-                "status": status,
-            }
-
-        feedback = (
-            f"Current PDF is {page_count} pages. Reduce to a single page without adding facts. "
-            "Shorten bullet text and keep structure identical."
-        )
-        attempt_tex = candidate_tex
-        stale_paths.append((temp_tex_path, temp_pdf_path))
+            if speculative is not None and page_count != assumed_pages:
+                # Its feedback quoted the wrong page count; shrink again with the real one.
+                speculative.cancel()
+                speculative = None
+            pending_candidate = speculative
+    finally:
+        # Do not block the caller on an in-flight speculative request we no longer need.
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    # If loop exits without success, return last attempt info
+    # If loop exits without success, return last attempt info and drop earlier drafts
+    _discard_in_background(stale_paths[:-1])
     version_id = temp_id
     status = "failed_compile" if last_error else status
     return {
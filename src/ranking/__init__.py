@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 from .embedding_utils import (
     build_faiss_index,
     bytes_to_embedding,
+    bytes_to_matrix,
     cosine_similarity_scores,
     embed_texts,
     embedding_to_bytes,
@@ -14,12 +15,15 @@ from .embedding_utils import (
     load_embedding_model,
     load_resume_text,
     strip_latex_markup,
+    top_k_scores,
+    warm_up_embedding_model,
 )
 from .llm_refiner import RankedJob, refine_scores
 
 __all__ = [
     "build_faiss_index",
     "bytes_to_embedding",
+    "bytes_to_matrix",
     "cosine_similarity_scores",
     "embed_texts",
     "embedding_to_bytes",
@@ -27,6 +31,8 @@ __all__ = [
     "load_embedding_model",
     "load_resume_text",
     "strip_latex_markup",
+    "top_k_scores",
+    "warm_up_embedding_model",
     "RankedJob",
     "refine_scores",
     "ranking_cli",
@@ -0,0 +1,53 @@
+"""Numba kernels for the ranking hot paths; import only through ``embedding_utils``."""
+
+from __future__ import annotations
+
+import numba
+import numpy as np
+
+
+def topk_dot(mat: np.ndarray, q: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Score every row of ``mat`` against ``q`` and return the top ``k`` (indices, scores)."""
+    # chunks <= len(mat) // k, so the first chunk alone holds at least k rows and the
+    # merged heaps contain k real jobs. Trailing chunks may be short or even empty;
+    # their unfilled slots keep the lowest finite float32 and sort last.
+    chunks = max(1, min(numba.get_num_threads(), len(mat) // k))
+    return _topk_dot(mat, q, k, chunks)
+
+
+# cache=True persists the compiled kernel under __pycache__, so only the first
+# process pays the JIT cost. Thread count is read outside: it would block caching.
+# fastmath omits "ninf"/"nnan" so comparisons against the heap sentinel stay defined.
+@numba.njit(parallel=True, fastmath={"nsz", "arcp", "contract", "reassoc"}, cache=True)
+def _topk_dot(mat, q, k, chunks):
+    rows, dim = mat.shape
+    step = (rows + chunks - 1) // chunks
+    heap_scores = np.full((chunks, k), np.finfo(np.float32).min, dtype=np.float32)
+    heap_indices = np.full((chunks, k), -1, dtype=np.int64)
+    for chunk in numba.prange(chunks):
+        scores = heap_scores[chunk]
+        indices = heap_indices[chunk]
+        for row in range(chunk * step, min(rows, (chunk + 1) * step)):
+            score = np.float32(0.0)
+            for col in range(dim):
+                score += mat[row, col] * q[col]
+            if score <= scores[0]:
+                continue
+            # Replace the min-heap root and sift the new entry down.
+            pos = 0
+            while True:
+                child = 2 * pos + 1
+                if child >= k:
+                    break
+                if child + 1 < k and scores[child + 1] < scores[child]:
+                    child += 1
+                if scores[child] >= score:
+                    break
+                scores[pos] = scores[child]
+                indices[pos] = indices[child]
+                pos = child
+            scores[pos] = score
+            indices[pos] = row
+    flat_scores = heap_scores.ravel()
+    order = np.argsort(-flat_scores, kind="mergesort")[:k]
+    return heap_indices.ravel()[order], flat_scores[order]
@@ -2,49 +2,169 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
-import re
+import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
-import faiss
 import numpy as np
-from pylatexenc.latex2text import LatexNodes2Text
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+
+# faiss, sentence-transformers (torch) and pylatexenc are imported where used so
+# callers that only (de)serialize embeddings don't pay seconds of import time.
+if TYPE_CHECKING:  # pragma: no cover - used for static analysis only
+    import faiss
+    from sentence_transformers import SentenceTransformer
 
 LOGGER = logging.getLogger(__name__)
-LATEX_TEXT_CONVERTER = LatexNodes2Text()
+EMBED_BATCH_SIZE = 64
+ONNX_INT8_SUFFIX = ":onnx-int8"
+ONNX_CACHE_DIR = Path.home() / ".cache" / "ai-job-assistant" / "onnx"
+ONNX_INT8_FILE = "model_quantized.onnx"
 
 
+@lru_cache(maxsize=32)
 def strip_latex_markup(text: str) -> str:
     """Convert LaTeX markup into plain text using pylatexenc."""
     try:
-        converted = LATEX_TEXT_CONVERTER.latex_to_text(text)
+        converted = _latex_converter().latex_to_text(text)
     except Exception as exc:  # pragma: no cover - pylatexenc failures are rare
         LOGGER.error("Failed to parse LaTeX resume: %s", exc)
         converted = text
-    condensed = re.sub(r"\s+", " ", converted)
-    return condensed.strip()
+    # split()/join collapses whitespace runs and trims in one C pass, no regex needed.
+    return " ".join(converted.split())
+
+
+@lru_cache(maxsize=1)
+def _latex_converter():
+    from pylatexenc.latex2text import LatexNodes2Text
+
+    return LatexNodes2Text()
 
 
 def load_resume_text(resume_path: Path) -> str:
-    """Load and clean the resume file."""
-    raw_text = resume_path.read_text(encoding="utf-8")
+    """Load and clean the resume file; an unchanged file costs a single stat()."""
+    stat = resume_path.stat()
+    return _load_resume_text(str(resume_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_resume_text(path_str: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns/size only key the cache so an edited resume is stripped again.
+    raw_text = Path(path_str).read_text(encoding="utf-8")
     cleaned = strip_latex_markup(raw_text)
     if not cleaned:
         LOGGER.warning("Resume text appears empty after stripping LaTeX markup.")
     return cleaned
 
 
+class OnnxEmbeddingModel:
+    """int8 ONNX Runtime encoder exposing the subset of ``SentenceTransformer.encode`` we use.
+
+    Pooling is the attention-masked mean followed by L2 normalization, which matches
+    mean-pooled sentence-transformers such as e5 and MiniLM.
+    """
+
+    def __init__(self, model: Any, tokenizer: Any, max_seq_length: int = 512) -> None:
+        self._model = model
+        self._tokenizer = tokenizer
+        self.max_seq_length = max_seq_length
+
+    def encode(
+        self,
+        sentences: Iterable[str],
+        *,
+        batch_size: int = EMBED_BATCH_SIZE,
+        normalize_embeddings: bool = True,
+        **_: Any,
+    ) -> np.ndarray:
+        sentences = list(sentences)
+        # Same length-sorted batching as SentenceTransformer.encode to keep padding low.
+        order = np.argsort([len(sentence) for sentence in sentences], kind="stable")
+        batches = []
+        for start in range(0, len(order), batch_size):
+            features = self._tokenizer(
+                [sentences[index] for index in order[start : start + batch_size]],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            hidden = self._model(**features).last_hidden_state
+            mask = features["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled.astype(np.float32))
+
+        embeddings = np.empty((len(sentences), batches[0].shape[1] if batches else 0), np.float32)
+        if batches:
+            embeddings[order] = np.concatenate(batches)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+        return embeddings
+
+
 @lru_cache(maxsize=2)
-def load_embedding_model(model_name: str) -> SentenceTransformer:
-    """Load a sentence-transformer model, caching instances by name."""
+def load_embedding_model(model_name: str) -> SentenceTransformer | OnnxEmbeddingModel:
+    """Load a sentence-transformer model, caching instances by name.
+
+    Names ending in ``:onnx-int8`` load a dynamically quantized ONNX export of the
+    base model instead (requires ``optimum[onnxruntime]``). The suffix is part of the
+    name, so its embeddings are cached separately from the FP32 model's.
+    """
+    if model_name.endswith(ONNX_INT8_SUFFIX):
+        return _load_onnx_int8_model(model_name[: -len(ONNX_INT8_SUFFIX)])
+    from sentence_transformers import SentenceTransformer
+
+    import torch
+
     LOGGER.info("Loading sentence-transformer model: %s", model_name)
+    # Some builds default to a single intra-op thread; encoding should use every core.
+    torch.set_num_threads(os.cpu_count() or 1)
     return SentenceTransformer(model_name)
 
 
+def warm_up_embedding_model(model_name: str) -> None:
+    """Load ``model_name`` and run one encode so the first real request skips lazy init.
+
+    The throwaway encode triggers torch's deferred CUDA/oneDNN setup, which otherwise
+    lands on whichever caller embeds first.
+    """
+    embed_texts(load_embedding_model(model_name), ["warmup"], model_name=model_name)
+
+
+def _load_onnx_int8_model(model_name: str) -> OnnxEmbeddingModel:
+    """Export and quantize ``model_name`` once, then load it from the local cache."""
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError as exc:
+        raise RuntimeError(
+            "ONNX embedding models require `pip install optimum[onnxruntime]`."
+        ) from exc
+
+    export_dir = ONNX_CACHE_DIR / model_name.replace("/", "--")
+    quantized_dir = export_dir / "int8"
+    if not (quantized_dir / ONNX_INT8_FILE).exists():
+        LOGGER.info("Exporting %s to int8 ONNX under %s", model_name, export_dir)
+        ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(
+            export_dir
+        )
+        ORTQuantizer.from_pretrained(export_dir).quantize(
+            save_dir=quantized_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(
+                is_static=False, per_channel=False
+            ),
+        )
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(quantized_dir)
+
+    LOGGER.info("Loading int8 ONNX embedding model: %s", model_name)
+    model = ORTModelForFeatureExtraction.from_pretrained(quantized_dir, file_name=ONNX_INT8_FILE)
+    return OnnxEmbeddingModel(model, AutoTokenizer.from_pretrained(quantized_dir))
+
+
 def _should_use_e5_formatting(model_name: str) -> bool:
     return "e5" in model_name.lower()
 
@@ -55,32 +175,99 @@ def _format_for_e5(texts: Iterable[str], is_query: bool) -> list[str]:
 
 
 def embed_texts(
-    model: SentenceTransformer,
+    model: SentenceTransformer | OnnxEmbeddingModel,
     texts: Iterable[str],
     *,
     model_name: str,
     is_query: bool = False,
+    batch_size: int = EMBED_BATCH_SIZE,
 ) -> np.ndarray:
-    """Embed one or more texts with the provided model."""
+    """Embed one or more texts with the provided model.
+
+    ``encode`` already length-sorts its input before batching, so each mini-batch
+    pads only to similar lengths; callers splitting large inputs should pre-sort by
+    length so that holds across calls too.
+    """
     prepared_texts = list(texts)
     if _should_use_e5_formatting(model_name):
         prepared_texts = _format_for_e5(prepared_texts, is_query=is_query)
 
-    embeddings = model.encode(
-        prepared_texts,
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-    )
-    return np.asarray(embeddings, dtype=np.float32)
+    with _bf16_autocast(model):
+        embeddings = model.encode(
+            prepared_texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+    # encode() already yields C-contiguous float32, in which case this is a no-op;
+    # callers rely on that layout to serialize rows straight from the buffer.
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def _bf16_autocast(
+    model: SentenceTransformer | OnnxEmbeddingModel,
+) -> contextlib.AbstractContextManager:
+    """Run a CUDA model's forward passes in BF16 for the duration of one encode call.
+
+    Scoped autocast leaves the weights and other torch users untouched. CPUs without
+    native BF16 would only emulate it, so CPU and ONNX models run in FP32 as before.
+    """
+    if isinstance(model, OnnxEmbeddingModel) or model.device.type != "cuda":
+        return contextlib.nullcontext()
+    import torch
+
+    return torch.autocast(device_type="cuda", dtype=torch.bfloat16)
 
 
 def cosine_similarity_scores(
     query_embedding: np.ndarray, document_embeddings: np.ndarray
 ) -> np.ndarray:
-    """Compute cosine similarity between a single query vector and a matrix of document vectors."""
-    query = np.atleast_2d(query_embedding)
-    similarities = cosine_similarity(query, document_embeddings)
-    return similarities[0]
+    """Compute cosine similarity between a single query vector and a matrix of document vectors.
+
+    Both operands must be L2-normalized (``embed_texts`` guarantees this), so the
+    cosine reduces to a single float32 matrix-vector product.
+    """
+    query = np.ascontiguousarray(query_embedding, dtype=np.float32).ravel()
+    return document_embeddings @ query
+
+
+def top_k_scores(
+    job_embeddings: np.ndarray, resume_embedding: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the indices and cosine scores of the ``k`` best-matching jobs, best first.
+
+    When numba is installed and ``k`` is smaller than the job count, scoring and
+    selection run as one parallel pass so the full score vector is never
+    materialized. Otherwise this falls back to a matmul plus argpartition/argsort.
+    """
+    count = len(job_embeddings)
+    k = min(k, count)
+    kernel = _topk_dot_kernel() if 0 < k < count else None
+    if kernel is not None:
+        return kernel(
+            np.ascontiguousarray(job_embeddings, dtype=np.float32),
+            np.ascontiguousarray(resume_embedding, dtype=np.float32).ravel(),
+            k,
+        )
+
+    scores = cosine_similarity_scores(resume_embedding, job_embeddings)
+    if k >= count:
+        order = np.argsort(-scores, kind="stable")
+    else:
+        top = np.argpartition(-scores, k)[:k]
+        order = top[np.argsort(-scores[top], kind="stable")]
+    return order, scores[order]
+
+
+@lru_cache(maxsize=1)
+def _topk_dot_kernel():
+    """Return the numba fused dot-product/top-k kernel, or None when numba is unavailable."""
+    try:
+        from ._numba_kernels import topk_dot
+    except ImportError:
+        return None
+    return topk_dot
 
 
 def embedding_to_bytes(embedding: np.ndarray) -> bytes:
@@ -93,8 +280,21 @@ def bytes_to_embedding(data: bytes) -> np.ndarray:
     return np.frombuffer(data, dtype=np.float32).copy()
 
 
+def bytes_to_matrix(blobs: Sequence[bytes]) -> np.ndarray:
+    """Deserialize equally sized float32 embeddings into one preallocated matrix."""
+    if not blobs:
+        return np.empty((0, 0), dtype=np.float32)
+    dimension = len(blobs[0]) // np.dtype(np.float32).itemsize
+    matrix = np.empty((len(blobs), dimension), dtype=np.float32)
+    for row, blob in enumerate(blobs):
+        matrix[row] = np.frombuffer(blob, dtype=np.float32, count=dimension)
+    return matrix
+
+
 def build_faiss_index(embeddings: np.ndarray) -> faiss.IndexFlatIP:
     """Create a FAISS index from normalized embeddings."""
+    import faiss
+
     if embeddings.dtype != np.float32:
         embeddings = embeddings.astype(np.float32)
     index = faiss.IndexFlatIP(embeddings.shape[1])
@@ -2,14 +2,46 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import importlib
 import logging
+import math
 import os
 import re
+import socket
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
 
 LOGGER = logging.getLogger(__name__)
+OLLAMA_DEFAULT_ADDRESS = ("127.0.0.1", 11434)
+OLLAMA_PROBE_TIMEOUT_SECONDS = 0.2
+DEFAULT_BLOCK_SIZE = 10
+DEFAULT_BLOCK_OVERLAP = 3
+MAX_BLOCK_WORKERS = 4
+BT_ITERATIONS = 100
+BT_PRIOR_GAMES = 1.0
+_JOB_SCORE_RE = re.compile(
+    r'"job_id"\s*:\s*"(?P<job_id>[^"]+)"[^}]*?"refined_score"\s*:\s*(?P<score>[^,\}\]]+)',
+    re.IGNORECASE | re.DOTALL,
+)
+_PROMPT_PREAMBLE = (
+    "You are re-ranking job descriptions for resume alignment. "
+    "Resume content for the candidate is provided below:\n"
+)
+_PROMPT_JOBS_INSTRUCTIONS = (
+    "\n\nGiven the JSON array of jobs below (each with job_id, score, description) "
+    "return a JSON array of objects where each object contains job_id and "
+    "refined_score between 0 and 1. Higher is better. Respond with JSON only.\n"
+    "Jobs: "
+)
+_ALL_ZEROS_RE = re.compile(r"0+")
+_LEADING_ZERO_FLOAT_RE = re.compile(r"0+[0-9]+(\.[0-9]+)?")
 
 
 @dataclass(frozen=True)
@@ -21,40 +53,77 @@ class RankedJob:
     score: float
 
 
+def refinement_cache_key(resume_hash: str, job: RankedJob) -> str:
+    """Key a refined score by the resume revision and the exact job text it judged."""
+    material = "\0".join((resume_hash, job.job_id, job.description))
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
 def _serialize_jobs(jobs: Iterable[RankedJob]) -> str:
     """Create a compact JSON payload for the prompt."""
     payload = [
         {"job_id": job.job_id, "score": job.score, "description": job.description}
         for job in jobs
     ]
-    return json.dumps(payload, ensure_ascii=False)
+    # Decode once at the prompt boundary; orjson emits UTF-8 without escaping.
+    return orjson.dumps(payload).decode("utf-8")
 
 
 def _build_prompt(jobs: Iterable[RankedJob], resume_text: str) -> str:
     """Construct a consistent instruction for reranking models."""
-    serialized = _serialize_jobs(jobs)
-    return (
-        "You are re-ranking job descriptions for resume alignment. "
-        "Resume content for the candidate is provided below:\n"
-        f"{resume_text}\n\n"
-        "Given the JSON array of jobs below (each with job_id, score, description) "
-        "return a JSON array of objects where each object contains job_id and "
-        "refined_score between 0 and 1. Higher is better. Respond with JSON only.\n"
-        f"Jobs: {serialized}"
+    return "".join(
+        (_PROMPT_PREAMBLE, resume_text, _PROMPT_JOBS_INSTRUCTIONS, _serialize_jobs(jobs))
     )
 
 
-def _refine_with_ollama(
-    jobs: List[RankedJob], resume_text: str, model_name: Optional[str]
-) -> Dict[str, float]:
-    """Use a local Ollama model to refine ranking."""
+@lru_cache(maxsize=None)
+def _optional_sdk(module_name: str) -> Optional[ModuleType]:
+    """Import a provider SDK once, remembering None when it is not installed.
+
+    Resolved on first use rather than at module import so ranking without an LLM
+    does not pay for loading every SDK.
+    """
     try:
-        import ollama  # type: ignore
+        return importlib.import_module(module_name)
     except ImportError:
+        return None
+
+
+# Clients are thread-safe and own their HTTP pools; reuse them so block calls keep alive.
+@lru_cache(maxsize=4)
+def _gemini_client(api_key: str):
+    return _optional_sdk("google.genai").Client(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str):
+    return _optional_sdk("openai").OpenAI(api_key=api_key)
+
+
+def _ollama_reachable() -> bool:
+    """Cheap TCP probe so auto-detect does not wait on a dead local server."""
+    host, port = OLLAMA_DEFAULT_ADDRESS
+    configured = os.environ.get("OLLAMA_HOST", "").split("://")[-1].rstrip("/")
+    if configured:
+        name, _, port_text = configured.rpartition(":")
+        if name and port_text.isdigit():
+            host, port = name, int(port_text)
+        else:
+            host = configured
+    try:
+        with socket.create_connection((host, port), timeout=OLLAMA_PROBE_TIMEOUT_SECONDS):
+            return True
+    except OSError:
+        return False
+
+
+def _refine_with_ollama(prompt: str, model_name: Optional[str]) -> Dict[str, float]:
+    """Use a local Ollama model to refine ranking."""
+    ollama = _optional_sdk("ollama")
+    if ollama is None:
         LOGGER.warning("ollama package not installed; skipping local rerank.")
         return {}
 
-    prompt = _build_prompt(jobs, resume_text)
     model_id = model_name or "phi3"
 
     LOGGER.debug("Ollama refinement request (%s): %s", model_id, prompt)
@@ -80,13 +149,10 @@ def _refine_with_ollama(
     return _parse_refined_scores(text)
 
 
-def _refine_with_gemini(
-    jobs: List[RankedJob], resume_text: str, model_name: Optional[str]
-) -> Dict[str, float]:
+def _refine_with_gemini(prompt: str, model_name: Optional[str]) -> Dict[str, float]:
     """Use Gemini to refine ranking, returning job_id to refined score."""
-    try:
-        from google import genai  # type: ignore
-    except ImportError:
+    genai = _optional_sdk("google.genai")
+    if genai is None:
         LOGGER.warning(
             "google-genai package not installed; skipping Gemini refinement."
         )
@@ -97,9 +163,8 @@ def _refine_with_gemini(
         LOGGER.warning("GOOGLE_API_KEY not set; skipping Gemini refinement.")
         return {}
 
-    client = genai.Client()
+    client = _gemini_client(api_key)
     model_id = model_name or "gemini-2.5-flash"
-    prompt = _build_prompt(jobs, resume_text)
 
     try:
         response = client.models.generate_content(
@@ -114,13 +179,10 @@ def _refine_with_gemini(
     return _parse_refined_scores(text)
 
 
-def _refine_with_openai(
-    jobs: List[RankedJob], resume_text: str, model_name: Optional[str]
-) -> Dict[str, float]:
+def _refine_with_openai(prompt: str, model_name: Optional[str]) -> Dict[str, float]:
     """Use the OpenAI client to refine the ranking."""
-    try:
-        from openai import OpenAI  # type: ignore
-    except ImportError:
+    openai = _optional_sdk("openai")
+    if openai is None:
         LOGGER.warning("openai package not installed; skipping GPT refinement.")
         return {}
 
@@ -129,8 +191,7 @@ def _refine_with_openai(
         LOGGER.warning("OPENAI_API_KEY not set; skipping GPT refinement.")
         return {}
 
-    client = OpenAI(api_key=api_key)
-    prompt = _build_prompt(jobs, resume_text)
+    client = _openai_client(api_key)
     model_id = model_name or "gpt-4.1-mini"
 
     try:
@@ -152,8 +213,8 @@ def _parse_refined_scores(response_text: str) -> Dict[str, float]:
         return {}
 
     try:
-        payload = json.loads(response_text)
-    except json.JSONDecodeError:
+        payload = orjson.loads(response_text)
+    except orjson.JSONDecodeError:
         LOGGER.error("Failed to decode LLM refinement payload: %s", response_text)
         return _parse_relaxed_scores(response_text)
 
@@ -175,13 +236,9 @@ def _parse_refined_scores(response_text: str) -> Dict[str, float]:
 
 def _parse_relaxed_scores(response_text: str) -> Dict[str, float]:
     """Fallback parser that tolerates loosely formatted JSON-like payloads."""
-    pattern = re.compile(
-        r'"job_id"\s*:\s*"(?P<job_id>[^"]+)"[^}]*?"refined_score"\s*:\s*(?P<score>[^,\}\]]+)',
-        re.IGNORECASE | re.DOTALL,
-    )
     refined: Dict[str, float] = {}
 
-    for match in pattern.finditer(response_text):
+    for match in _JOB_SCORE_RE.finditer(response_text):
         job_id = match.group("job_id").strip()
         score_raw = match.group("score").strip()
         if not job_id or not score_raw:
@@ -196,9 +253,9 @@ def _parse_relaxed_scores(response_text: str) -> Dict[str, float]:
             )
             continue
 
-        if re.fullmatch(r"0+", normalized):
+        if _ALL_ZEROS_RE.fullmatch(normalized):
             normalized = "0"
-        elif re.fullmatch(r"0+[0-9]+(\.[0-9]+)?", normalized):
+        elif _LEADING_ZERO_FLOAT_RE.fullmatch(normalized):
             normalized = normalized.lstrip("0")
             if normalized.startswith("."):
                 normalized = f"0{normalized}"
@@ -218,19 +275,125 @@ def _parse_relaxed_scores(response_text: str) -> Dict[str, float]:
     return refined
 
 
+def _build_blocks(
+    jobs: Sequence[RankedJob], block_size: int, overlap: int
+) -> List[Sequence[RankedJob]]:
+    """Split ``jobs`` into windows of ``block_size`` sharing ``overlap`` jobs with the next."""
+    stride = block_size - overlap
+    blocks: List[Sequence[RankedJob]] = []
+    start = 0
+    while True:
+        blocks.append(jobs[start : start + block_size])
+        if start + block_size >= len(jobs):
+            return blocks
+        start += stride
+
+
+def _aggregate_block_scores(block_scores: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """Reconcile per-block scores into one scale with a Bradley-Terry fit.
+
+    Every pair of jobs judged in the same block is one comparison; overlapping
+    jobs link the blocks into a single tournament graph. Strengths are fitted with
+    the standard MM iteration and mapped onto [0, 1].
+    """
+    wins: Dict[str, float] = defaultdict(float)
+    games: Dict[Tuple[str, str], float] = defaultdict(float)
+    for scores in block_scores:
+        judged = list(scores.items())
+        for index, (first, first_score) in enumerate(judged):
+            wins[first] += 0.0
+            for second, second_score in judged[index + 1 :]:
+                games[(first, second) if first < second else (second, first)] += 1.0
+                if first_score > second_score:
+                    wins[first] += 1.0
+                elif second_score > first_score:
+                    wins[second] += 1.0
+                else:
+                    wins[first] += 0.5
+                    wins[second] += 0.5
+    if not wins:
+        return {}
+
+    opponents: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+    for (first, second), count in games.items():
+        # A drawn pseudo-game per edge keeps undefeated/winless jobs finite.
+        count += BT_PRIOR_GAMES
+        wins[first] += BT_PRIOR_GAMES / 2
+        wins[second] += BT_PRIOR_GAMES / 2
+        opponents[first].append((second, count))
+        opponents[second].append((first, count))
+
+    strength = dict.fromkeys(wins, 1.0)
+    for _ in range(BT_ITERATIONS):
+        updated = dict(strength)
+        for job_id, edges in opponents.items():
+            own = strength[job_id]
+            updated[job_id] = wins[job_id] / sum(
+                count / (own + strength[other]) for other, count in edges
+            )
+        scale = len(updated) / sum(updated.values())
+        strength = {job_id: value * scale for job_id, value in updated.items()}
+
+    log_strength = {job_id: math.log(value) for job_id, value in strength.items()}
+    low = min(log_strength.values())
+    spread = max(log_strength.values()) - low
+    if spread <= 0:
+        return dict.fromkeys(log_strength, 0.5)
+    return {job_id: (value - low) / spread for job_id, value in log_strength.items()}
+
+
+def _refine_prompt(prompt: str, provider: str, model_name: Optional[str]) -> Dict[str, float]:
+    """Send one prompt to ``provider`` (or the auto-detected one) and parse the scores."""
+    if provider == "ollama":
+        return _refine_with_ollama(prompt, model_name)
+
+    if provider == "gemini":
+        return _refine_with_gemini(prompt, model_name)
+
+    if provider == "openai":
+        return _refine_with_openai(prompt, model_name)
+
+    # Auto-detect provider preference; only try Ollama when something is listening.
+    if _ollama_reachable():
+        local_result = _refine_with_ollama(prompt, model_name)
+        if local_result:
+            return local_result
+    else:
+        LOGGER.debug("Ollama not reachable; skipping local rerank.")
+
+    if os.environ.get("GOOGLE_API_KEY"):
+        return _refine_with_gemini(prompt, model_name)
+    if os.environ.get("OPENAI_API_KEY"):
+        return _refine_with_openai(prompt, model_name)
+
+    LOGGER.warning("LLM refinement requested but no provider configured; skipping.")
+    return {}
+
+
 def refine_scores(
     jobs: List[RankedJob],
     resume_text: str,
     provider: Optional[str] = None,
     model_name: Optional[str] = None,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    overlap: int = DEFAULT_BLOCK_OVERLAP,
+    max_workers: int = MAX_BLOCK_WORKERS,
 ) -> Dict[str, float]:
     """Refine similarity scores using an LLM if configured.
 
+    Up to ``block_size`` jobs are judged in a single prompt. Larger lists are split
+    into overlapping blocks that are judged concurrently and then reconciled into
+    one ranking (Joint Rank), so the result is relative: best job 1.0, worst 0.0.
+
     Args:
         jobs: Top candidate jobs sorted by similarity.
         resume_text: Full resume content used to judge alignment.
         provider: Optional explicit provider, e.g. 'gemini' or 'openai'.
         model_name: Optional override for the downstream LLM model id.
+        block_size: Maximum number of jobs per LLM prompt.
+        overlap: Jobs shared by consecutive blocks; must be in [1, block_size).
+        max_workers: Maximum number of blocks sent to the provider concurrently.
 
     Returns:
         Mapping of job_id to refined score. Empty if refinement skipped.
@@ -238,6 +401,8 @@ def refine_scores(
 
     if not jobs:
         return {}
+    if block_size < 2 or not 1 <= overlap < block_size:
+        raise ValueError("block_size must be at least 2 and overlap in [1, block_size).")
 
     normalized_provider = (provider or "").lower()
 
@@ -245,24 +410,18 @@ def refine_scores(
         LOGGER.warning("Unknown LLM provider %s; skipping refinement.", provider)
         return {}
 
-    if normalized_provider == "ollama":
-        return _refine_with_ollama(jobs, resume_text, model_name)
-
-    if normalized_provider == "gemini":
-        return _refine_with_gemini(jobs, resume_text, model_name)
-
-    if normalized_provider == "openai":
-        return _refine_with_openai(jobs, resume_text, model_name)
-
-    # Auto-detect provider preference.
-    local_result = _refine_with_ollama(jobs, resume_text, model_name)
-    if local_result:
-        return local_result
-
-    if os.environ.get("GOOGLE_API_KEY"):
-        return _refine_with_gemini(jobs, resume_text, model_name)
-    if os.environ.get("OPENAI_API_KEY"):
-        return _refine_with_openai(jobs, resume_text, model_name)
-
-    LOGGER.warning("LLM refinement requested but no provider configured; skipping.")
-    return {}
+    if len(jobs) <= block_size:
+        return _refine_prompt(_build_prompt(jobs, resume_text), normalized_provider, model_name)
+
+    blocks = _build_blocks(jobs, block_size, overlap)
+    LOGGER.info("Refining %d jobs in %d overlapping blocks.", len(jobs), len(blocks))
+    with ThreadPoolExecutor(max_workers=max(1, min(len(blocks), max_workers))) as pool:
+        block_scores = list(
+            pool.map(
+                lambda block: _refine_prompt(
+                    _build_prompt(block, resume_text), normalized_provider, model_name
+                ),
+                blocks,
+            )
+        )
+    return _aggregate_block_scores(block_scores)
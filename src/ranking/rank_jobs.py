@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -9,33 +10,38 @@ from pathlib import Path
 from typing import Dict, List, Optional, Sequence
 
 import numpy as np
-import pandas as pd
 import typer
 
 from .embedding_utils import (
-    build_faiss_index,
     bytes_to_embedding,
+    bytes_to_matrix,
+    cosine_similarity_scores,
     embed_texts,
     embedding_to_bytes,
-    faiss_search,
     load_embedding_model,
     load_resume_text,
 )
-from .llm_refiner import RankedJob, refine_scores
+from .llm_refiner import DEFAULT_BLOCK_SIZE, RankedJob, refine_scores, refinement_cache_key
 from ..sql import (
     ensure_schema,
+    fetch_cached_refinements,
     fetch_job_descriptions,
     fetch_job_embeddings,
     fetch_resume_embedding,
-    upsert_job_embedding,
+    upsert_job_embeddings,
     upsert_resume_embedding,
-    upsert_score,
+    store_refinements,
+    upsert_scores,
 )
 
 LOGGER = logging.getLogger(__name__)
 DEFAULT_RESUME_PATH = Path("config/resume.tex")
 DEFAULT_DB_PATH = Path("data/jobs.db")
 DEFAULT_MODEL = "intfloat/e5-base-v2"
+DISPLAY_LIMIT = 5
+EMBED_CHUNK_SIZE = 256
+# Candidates whose base scores are this close give the LLM nothing to re-order.
+MIN_LLM_SCORE_SPREAD = 1e-6
 
 app = typer.Typer(help="Rank stored job descriptions against the resume.")
 
@@ -88,40 +94,51 @@ def _load_job_embeddings(
     job_ids = [job.job_id for job in jobs]
     cached = fetch_job_embeddings(db_path, job_ids, model_name)
 
-    embedding_map: Dict[str, np.ndarray] = {}
-    missing_jobs: List[JobDescription] = []
-    missing_texts: List[str] = []
+    # Keep everything as serialized rows and decode once into the final matrix.
+    blobs: Dict[str, bytes | memoryview] = {job_id: blob for job_id, blob in cached.items() if blob}
+    missing_jobs = [job for job in jobs if job.job_id not in blobs]
 
-    for job in jobs:
-        blob = cached.get(job.job_id)
-        if blob:
-            embedding_map[job.job_id] = bytes_to_embedding(blob)
-        else:
-            missing_jobs.append(job)
-            missing_texts.append(job.description)
+    # Reposts share a description verbatim; embed each distinct text once.
+    duplicates: Dict[bytes, List[JobDescription]] = {}
+    for job in missing_jobs:
+        digest = hashlib.blake2b(job.description.encode("utf-8"), digest_size=16).digest()
+        duplicates.setdefault(digest, []).append(job)
+    # Length-homogeneous chunks keep per-batch padding small across embed_texts calls.
+    unique_groups = sorted(duplicates.values(), key=lambda group: len(group[0].description))
 
     if missing_jobs:
-        LOGGER.info("Embedding %d new job descriptions.", len(missing_jobs))
+        LOGGER.info(
+            "Embedding %d new job descriptions (%d unique).",
+            len(missing_jobs),
+            len(unique_groups),
+        )
+    # Encode in fixed-size chunks so tokenizer/activation memory stays bounded and
+    # finished chunks are persisted even if a later one fails.
+    for start in range(0, len(unique_groups), EMBED_CHUNK_SIZE):
+        chunk = unique_groups[start : start + EMBED_CHUNK_SIZE]
         new_embeddings = embed_texts(
             model,
-            missing_texts,
+            [group[0].description for group in chunk],
             model_name=model_name,
             is_query=False,
         )
-        for job, embedding in zip(missing_jobs, new_embeddings):
-            embedding_map[job.job_id] = embedding
-            upsert_job_embedding(
-                db_path, job.job_id, model_name, embedding_to_bytes(embedding)
-            )
+        # Serialize rows as zero-copy slices of the chunk's float32 buffer.
+        buffer = memoryview(new_embeddings).cast("B")
+        row_bytes = buffer.nbytes // len(chunk)
+        rows = []
+        for position, group in enumerate(chunk):
+            blob = buffer[position * row_bytes : (position + 1) * row_bytes]
+            for job in group:
+                blobs[job.job_id] = blob
+                rows.append((job.job_id, blob))
+        upsert_job_embeddings(db_path, model_name, rows)
 
     try:
-        matrix = np.vstack([embedding_map[job.job_id] for job in jobs])
+        return bytes_to_matrix([blobs[job.job_id] for job in jobs])
     except KeyError as exc:
         missing = exc.args[0]
         raise RuntimeError(f"Missing embedding for job_id {missing}") from exc
 
-    return np.asarray(matrix, dtype=np.float32)
-
 
 def _load_resume_embedding(
     db_path: Path,
@@ -129,9 +146,10 @@ def _load_resume_embedding(
     model_name: str,
     resume_path: Path,
     resume_text: str,
+    resume_hash: str,
 ) -> np.ndarray:
-    """Retrieve or compute the resume embedding."""
-    cached = fetch_resume_embedding(db_path, resume_path, model_name)
+    """Retrieve or compute the resume embedding, keyed by the text's content hash."""
+    cached = fetch_resume_embedding(db_path, resume_hash, model_name)
     if cached:
         return bytes_to_embedding(cached)
 
@@ -143,35 +161,33 @@ def _load_resume_embedding(
         is_query=True,
     )[0]
     upsert_resume_embedding(
-        db_path, resume_path, model_name, embedding_to_bytes(embedding)
+        db_path, resume_path, resume_hash, model_name, embedding_to_bytes(embedding)
     )
     return embedding
 
 
 def _print_top_results(
     scores: Sequence[tuple[JobDescription, float, Optional[float]]],
-    limit: int = 5,
+    limit: int = DISPLAY_LIMIT,
 ) -> None:
     """Print the top-N scores in a simple table."""
-    data = [
-        {
-            "job_id": job.job_id,
-            "score": base_score,
-            "llm_refined_score": refined,
-        }
-        for job, base_score, refined in scores[:limit]
-    ]
-    if not data:
+    rows = scores[:limit]
+    if not rows:
         typer.echo("No scores to display.")
         return
 
-    frame = pd.DataFrame(data)
-    display = frame.copy()
-    display["score"] = display["score"].map(lambda value: f"{value:.4f}")
-    display["llm_refined_score"] = display["llm_refined_score"].map(
-        lambda value: "-" if value is None else f"{value:.4f}"
-    )
-    typer.echo(display.to_string(index=False))
+    typer.echo(f"{'job_id':<24} {'score':>8} {'llm_refined_score':>18}")
+    for job, base_score, refined in rows:
+        refined_text = "-" if refined is None else f"{refined:.4f}"
+        typer.echo(f"{job.job_id:<24} {base_score:8.4f} {refined_text:>18}")
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the ``k`` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
 
 
 def _prepare_llm_jobs(
@@ -186,6 +202,60 @@ def _prepare_llm_jobs(
     return top_jobs
 
 
+def _refine_with_cache(
+    db_path: Path,
+    candidates: List[RankedJob],
+    resume_text: str,
+    resume_hash: str,
+    provider: Optional[str],
+    model_name: Optional[str],
+    concurrency: int,
+) -> Dict[str, float]:
+    """Refine ``candidates``, reusing stored scores for unchanged resume/job pairs.
+
+    Only single-prompt runs are cached: those scores are the LLM's own per-job
+    judgements. Larger lists are reconciled across blocks into scores relative to the
+    whole batch, which cannot be mixed with scores from other batches.
+    """
+    if len(candidates) > DEFAULT_BLOCK_SIZE:
+        LOGGER.info("Refining %d jobs in blocks; LLM score cache not used.", len(candidates))
+        return refine_scores(
+            candidates,
+            resume_text,
+            provider=provider,
+            model_name=model_name,
+            max_workers=concurrency,
+        )
+
+    cache_keys = {job.job_id: refinement_cache_key(resume_hash, job) for job in candidates}
+    cached = fetch_cached_refinements(db_path, cache_keys.values())
+    refined = {
+        job_id: cached[key] for job_id, key in cache_keys.items() if key in cached
+    }
+    if refined:
+        LOGGER.info("Reusing cached LLM scores for %d jobs.", len(refined))
+
+    misses = [job for job in candidates if job.job_id not in refined]
+    if misses:
+        fresh = refine_scores(
+            misses,
+            resume_text,
+            provider=provider,
+            model_name=model_name,
+            max_workers=concurrency,
+        )
+        store_refinements(
+            db_path,
+            [
+                (cache_keys[job_id], job_id, score)
+                for job_id, score in fresh.items()
+                if job_id in cache_keys
+            ],
+        )
+        refined.update(fresh)
+    return refined
+
+
 @app.command()
 def main(
     db_path: Path = typer.Option(DEFAULT_DB_PATH, help="Path to the SQLite database."),
@@ -193,7 +263,8 @@ def main(
         DEFAULT_RESUME_PATH, help="Path to the LaTeX resume."
     ),
     model_name: str = typer.Option(
-        DEFAULT_MODEL, help="Sentence-transformer model name."
+        DEFAULT_MODEL,
+        help="Sentence-transformer model name; append ':onnx-int8' for a quantized ONNX run.",
     ),
     use_llm: bool = typer.Option(
         False,
@@ -207,6 +278,16 @@ def main(
         None, help="Override remote LLM model id when --use-llm is set."
     ),
     llm_top_n: int = typer.Option(5, help="Number of top jobs to send to the LLM."),
+    llm_concurrency: int = typer.Option(
+        4, min=1, help="Maximum concurrent LLM requests when refining in blocks."
+    ),
+    llm_cache: bool = typer.Option(
+        True,
+        help=(
+            "Reuse LLM scores for jobs whose resume and description are unchanged "
+            "(only when the top N fits in one LLM prompt)."
+        ),
+    ),
     log_level: Optional[str] = typer.Option(
         None,
         "--log-level",
@@ -222,6 +303,7 @@ def main(
     resume_text = load_resume_text(resume_path)
     if not resume_text:
         raise typer.BadParameter(f"Resume at {resume_path} is empty or unreadable.")
+    resume_hash = hashlib.blake2b(resume_text.encode("utf-8"), digest_size=16).hexdigest()
 
     LOGGER.info("Fetching job descriptions from %s", db_path)
     jobs = _load_jobs_from_db(db_path)
@@ -229,55 +311,68 @@ def main(
     model = load_embedding_model(model_name)
     LOGGER.info("Preparing embeddings with model %s", model_name)
     resume_embedding = _load_resume_embedding(
-        db_path, model, model_name, resume_path, resume_text
+        db_path, model, model_name, resume_path, resume_text, resume_hash
     )
     job_embeddings = _load_job_embeddings(db_path, model, model_name, jobs)
 
-    faiss_index = build_faiss_index(job_embeddings)
-    search_k = len(jobs)
-    _, faiss_indices = faiss_search(faiss_index, resume_embedding, search_k)
-    base_scores = job_embeddings @ np.asarray(resume_embedding, dtype=np.float32)
-    base_scores_map: Dict[str, float] = {
-        job.job_id: float(score) for job, score in zip(jobs, base_scores)
-    }
-
-    ranked_jobs: List[tuple[JobDescription, float]] = []
-    for rank_idx, job_index in enumerate(faiss_indices):
-        if job_index < 0 or job_index >= len(jobs):
-            continue
-        job = jobs[job_index]
-        ranked_jobs.append((job, base_scores_map[job.job_id]))
+    # Every job's score is persisted, so one matrix-vector product over the corpus is
+    # the whole ranking cost; an ANN index would only add a second pass.
+    base_scores = cosine_similarity_scores(resume_embedding, job_embeddings)
+
+    # Only the LLM candidates and the printed rows need an order; selecting them from
+    # the scores above avoids a second pass over the embeddings and keeps the shown
+    # scores identical to the persisted ones.
+    top_k = max(DISPLAY_LIMIT, llm_top_n if use_llm else 0)
+    order = _top_k_indices(base_scores, top_k)
+    ranked_jobs: List[tuple[JobDescription, float]] = [
+        (jobs[index], float(base_scores[index])) for index in order.tolist()
+    ]
 
     refined_scores: Dict[str, float] = {}
     if use_llm:
         LOGGER.info("LLM refinement requested; preparing top %d jobs.", llm_top_n)
         llm_candidates = _prepare_llm_jobs(ranked_jobs, max(1, llm_top_n))
-        refined_scores = refine_scores(
-            llm_candidates,
-            resume_text,
-            provider=llm_provider,
-            model_name=llm_model,
+        candidate_scores = np.fromiter(
+            (job.score for job in llm_candidates), dtype=np.float32, count=len(llm_candidates)
         )
+        if len(llm_candidates) < 2 or np.ptp(candidate_scores) < MIN_LLM_SCORE_SPREAD:
+            LOGGER.info("Nothing for the LLM to re-rank among the top candidates; skipping.")
+        elif llm_cache:
+            refined_scores = _refine_with_cache(
+                db_path,
+                llm_candidates,
+                resume_text,
+                resume_hash,
+                llm_provider,
+                llm_model,
+                llm_concurrency,
+            )
+        else:
+            refined_scores = refine_scores(
+                llm_candidates,
+                resume_text,
+                provider=llm_provider,
+                model_name=llm_model,
+                max_workers=llm_concurrency,
+            )
         LOGGER.info("LLM returned refined scores for %d jobs.", len(refined_scores))
 
     LOGGER.info("Persisting scores to SQLite at %s", db_path)
-    for job in jobs:
-        base_score = base_scores_map[job.job_id]
-        refined_score = refined_scores.get(job.job_id)
-        upsert_score(db_path, job.job_id, float(base_score), refined_score)
+    upsert_scores(
+        db_path,
+        [
+            (job.job_id, score, refined_scores.get(job.job_id))
+            for job, score in zip(jobs, base_scores.tolist())
+        ],
+    )
 
     ranked_with_refined: List[tuple[JobDescription, float, Optional[float]]] = [
-        (
-            job,
-            base_scores_map[job.job_id],
-            refined_scores.get(job.job_id),
-        )
-        for job, _ in ranked_jobs
+        (job, score, refined_scores.get(job.job_id)) for job, score in ranked_jobs
     ]
 
     _print_top_results(ranked_with_refined)
 
-    typer.echo(f"Updated {len(ranked_jobs)} records at {datetime.now().isoformat()}.")
+    typer.echo(f"Updated {len(jobs)} records at {datetime.now().isoformat()}.")
 
 
 if __name__ == "__main__":
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import logging
+import operator
+import os
+import queue
 import re
 import sys
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import ParseResult, parse_qsl, urlencode, urlparse, urlunparse
 
 import typer
@@ -21,14 +26,109 @@ from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
 from .login import login_to_linkedin
-from ..sql import ensure_schema, insert_job_dataclass
+from ..sql import JOB_COLUMNS, ensure_schema, fetch_known_job_ids, insert_jobs, open_connection
 
 LOGGER = logging.getLogger(__name__)
 
 app = typer.Typer(help="Scrape LinkedIn job postings and persist them to SQLite.")
-
-
-@dataclass
+# Pulls a positional insert row straight off a JobPosting, without asdict's deep copy.
+_job_row = operator.attrgetter(*JOB_COLUMNS)
+_SALARY_RE = re.compile(r"\$?\s*([0-9]+(?:\.[0-9]+)?)([kKmM]?)")
+# Free-text fallback: require a dollar sign and accept thousands separators.
+_DESCRIPTION_SALARY_RE = re.compile(
+    r"\$\s*([0-9]{1,3}(?:,[0-9]{3})+|[0-9]+(?:\.[0-9]+)?)([kKmM]?)"
+)
+# Salary, when present in the description, sits near the top; bound the scan.
+DESCRIPTION_SALARY_SCAN_CHARS = 4000
+# Dollar amounts outside this band are funding, bonuses or hourly rates, not salaries.
+MIN_DESCRIPTION_SALARY = 10_000.0
+MAX_DESCRIPTION_SALARY = 2_000_000.0
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPOSTED_RE = re.compile(r"^Reposted\s+", re.IGNORECASE)
+_RELATIVE_TIME_RE = re.compile(
+    r"(?i)(\d+)\s+(hour|hours|day|days|week|weeks|month|months)\s+ago"
+)
+# Scraped postings are handed to a writer thread and flushed in batches of this size.
+PERSIST_BATCH_SIZE = 32
+PERSIST_QUEUE_SIZE = 100
+# Card-list settle polling: back off from 100 ms to 500 ms, give up after 1.5 s.
+CARD_POLL_INITIAL_SECONDS = 0.1
+CARD_POLL_MAX_SECONDS = 0.5
+CARD_POLL_BACKOFF = 1.5
+CARD_SETTLE_TIMEOUT_SECONDS = 1.5
+_DETAIL_SELECTOR = "#job-details"
+_COMPANY_SCOPE_SELECTORS = (
+    ".jobs-unified-top-card__primary-description",
+    ".jobs-unified-top-card__content-container",
+    ".jobs-unified-top-card__subtitle",
+    ".jobs-details-top-card__company-url",
+)
+_RECRUITER_SELECTOR = (
+    ".job-details-people-who-can-help__section--two-pane > "
+    "div:nth-child(2) > div:nth-child(1) > a:nth-child(1)"
+)
+_SALARY_SELECTOR = (
+    ".job-details-fit-level-preferences > "
+    "button:nth-child(1) > span:nth-child(1) > strong:nth-child(1)"
+)
+_DEFAULT_POSTING_TIME_SELECTORS = (
+    "div.mt2:nth-child(1) > span:nth-child(1) > span:nth-child(3)",
+)
+# Reads everything a posting needs from the card and detail panel in one round trip,
+# mirroring the per-field Locator lookups (first match per selector, trimmed innerText).
+_CARD_SNAPSHOT_JS = """
+(card, opts) => {
+  const text = (el) => (el && el.innerText ? el.innerText.trim() : "");
+  const firstText = (root, selectors) => {
+    for (const selector of selectors) {
+      const value = text(root.querySelector(selector));
+      if (value) return value;
+    }
+    return null;
+  };
+  const findLink = (roots) => {
+    for (const root of roots) {
+      for (const selector of opts.companyLinks) {
+        const link = root.querySelector(selector);
+        if (!link) continue;
+        const href = link.getAttribute("href");
+        const label = text(link);
+        if (href || label) return { href, text: label || null };
+      }
+    }
+    return null;
+  };
+  const detail = document.querySelector(opts.detail);
+  let company = findLink([card]) || (detail && findLink([detail]));
+  for (const scope of opts.companyScopes) {
+    if (company) break;
+    company = findLink(Array.from(document.querySelectorAll(scope)));
+  }
+  if (!company && opts.companyLinks.length) {
+    const link = document.querySelector(opts.companyLinks[0]);
+    if (link) company = { href: link.getAttribute("href"), text: text(link) || null };
+  }
+  const recruiter = document.querySelector(opts.recruiter);
+  return {
+    title: firstText(card, opts.title),
+    companyText: firstText(card, opts.company),
+    companyHref: company ? company.href : null,
+    companyLinkText: company ? company.text : null,
+    description: detail ? text(detail) : "",
+    recruiterHref: recruiter ? recruiter.getAttribute("href") : null,
+    salaryText: text(document.querySelector(opts.salary)),
+    postingTimes: opts.postingTime.map((selector) => text(document.querySelector(selector))),
+  };
+}
+"""
+# Detail-panel settle polling replaces a fixed 500 ms pause per card.
+DETAIL_POLL_SECONDS = 0.05
+DETAIL_SETTLE_TIMEOUT_SECONDS = 0.5
+_VIEW_ID_RE = re.compile(r"/view/(\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+@dataclass(slots=True)
 class JobPosting:
     """Container for scraped job posting details."""
 
@@ -45,7 +145,7 @@ class JobPosting:
     apply_url: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScrapingConfig:
     """Configuration derived from config/scraping.yaml."""
 
@@ -120,26 +220,54 @@ class JobParserAgent:
         self._base_search_parts: Optional[ParseResult] = None
         self._base_query: Dict[str, str] = {}
         self._initial_offset: int = 0
+        self._card_selector: Optional[str] = None
+        self._search_url_parts: Optional[Tuple[str, str]] = None
+        # The configured base URL never changes; parse it once rather than per page.
+        self._config_base_parts = urlparse(scraping_config.base_url)
+        self._config_base_query: Dict[str, str] = {
+            key: value
+            for key, value in parse_qsl(self._config_base_parts.query)
+            if key != scraping_config.start_param
+        }
+        self._config_base_query.update(scraping_config.extra_params)
+        self._snapshot_opts = self._snapshot_options()
 
         ensure_schema(self.database_path)
+        # One handle for the whole run keeps the WAL writer warm between page flushes.
+        self._conn = open_connection(self.database_path)
+        # Cards stored by earlier runs are skipped before any click/scrape work.
+        self._known_job_ids = fetch_known_job_ids(self._conn)
+        self._persist_queue: "queue.Queue[Optional[JobPosting]]" = queue.Queue(
+            maxsize=PERSIST_QUEUE_SIZE
+        )
+        # First failure seen by the persist worker, re-raised once the run has drained.
+        self._persist_error: Optional[Exception] = None
 
     def run(self) -> List[JobPosting]:
         """Execute the full scraping pipeline."""
-        with sync_playwright() as playwright:
-            browser = self._start_browser(playwright)
-            context, page = login_to_linkedin(
-                browser,
-                wait_timeout=self.wait_timeout,
-                login_file=self.login_file,
-            )
-            try:
-                LOGGER.info("Preparing job search for: %s", self.job_title)
-                self._initialize_job_search(page)
-                LOGGER.info("Collecting job postings for: %s", self.job_title)
-                postings = self._collect_jobs(page)
-            finally:
-                context.close()
-                browser.close()
+        # Writes overlap with navigation; SQLite serialises writers anyway.
+        persist_thread = threading.Thread(
+            target=self._persist_worker, name="job-persist", daemon=True
+        )
+        persist_thread.start()
+        try:
+            with sync_playwright() as playwright, self._start_browser(playwright) as browser:
+                context, page = login_to_linkedin(
+                    browser,
+                    wait_timeout=self.wait_timeout,
+                    login_file=self.login_file,
+                )
+                with context:
+                    LOGGER.info("Preparing job search for: %s", self.job_title)
+                    self._initialize_job_search(page)
+                    LOGGER.info("Collecting job postings for: %s", self.job_title)
+                    postings = self._collect_jobs(page)
+        finally:
+            self._persist_queue.put(None)
+            persist_thread.join()
+            self._conn.close()
+        if self._persist_error is not None:
+            raise self._persist_error
 
         LOGGER.info("Collected %d job postings this run.", len(postings))
         return postings
@@ -154,7 +282,7 @@ class JobParserAgent:
             search_url, wait_until="domcontentloaded", timeout=self.wait_timeout * 1000
         )
         page.wait_for_load_state("domcontentloaded")
-        time.sleep(self.config.page_delay_seconds)
+        self._wait_for_cards(page)
         LOGGER.info("Arrived at job search page: %s", page.url)
         self._update_base_search_from_url(page.url)
 
@@ -165,6 +293,7 @@ class JobParserAgent:
         first_iteration = True
 
         while len(collected) < self.max_jobs:
+            page_started = time.monotonic()
             search_url = self._build_search_url(offset)
             if first_iteration:
                 LOGGER.info(
@@ -187,19 +316,18 @@ class JobParserAgent:
                     page.goto(search_url, wait_until="domcontentloaded")
                 page.wait_for_load_state("domcontentloaded")
 
-            loaded_count = self._ensure_job_cards_loaded(page, len(collected))
+            loaded_count = self._wait_for_cards(page, page_started)
             LOGGER.debug("Job cards discovered after load: %d", loaded_count)
-            time.sleep(self.config.page_delay_seconds)
 
-            scraped_this_page = self._scrape_jobs_on_page(page, collected, seen_job_ids)
+            processed_this_page = self._scrape_jobs_on_page(page, collected, seen_job_ids)
             LOGGER.info(
-                "Captured %d jobs from current page (offset=%d). Total collected: %d.",
-                scraped_this_page,
+                "Processed %d jobs from current page (offset=%d). Total collected: %d.",
+                processed_this_page,
                 offset,
                 len(collected),
             )
 
-            if scraped_this_page == 0:
+            if processed_this_page == 0:
                 LOGGER.warning(
                     "No job cards processed on this page; stopping pagination."
                 )
@@ -231,6 +359,7 @@ class JobParserAgent:
 
         total_cards = min(total_cards, self.config.page_size)
         scraped = 0
+        skipped_known = 0
 
         for index in range(total_cards):
             if len(collected) >= self.max_jobs:
@@ -244,6 +373,10 @@ class JobParserAgent:
             if job_id in seen_job_ids:
                 LOGGER.debug("Skipping duplicate job id %s at index %d.", job_id, index)
                 continue
+            if job_id in self._known_job_ids:
+                LOGGER.debug("Skipping stored job id %s at index %d.", job_id, index)
+                skipped_known += 1
+                continue
 
             posting = self._scrape_job_card(page, card, job_id)
             if posting is None:
@@ -252,44 +385,14 @@ class JobParserAgent:
             collected.append(posting)
             seen_job_ids.add(job_id)
             scraped += 1
-            inserted = self._persist_job(posting)
-
-            log_company = posting.company_url or posting.company
-            recruiter_log = posting.recruiter_url or "(no recruiter)"
-            posting_time_log = posting.posting_time or "-"
-            salary_log = "-"
-            if posting.salary_min is not None:
-                if (
-                    posting.salary_max is not None
-                    and posting.salary_max != posting.salary_min
-                ):
-                    salary_log = f"{int(posting.salary_min)}-{int(posting.salary_max)}"
-                else:
-                    salary_log = f"{int(posting.salary_min)}"
-
-            if inserted:
-                LOGGER.info(
-                    "Captured job %s: %s @ %s recruiter: %s salary: %s posted: %s",
-                    job_id,
-                    posting.title,
-                    log_company,
-                    recruiter_log,
-                    salary_log,
-                    posting_time_log,
-                )
-            else:
-                LOGGER.info(
-                    "Captured job %s already stored @ %s recruiter: %s salary: %s posted: %s",
-                    job_id,
-                    log_company,
-                    recruiter_log,
-                    salary_log,
-                    posting_time_log,
-                )
+            self._known_job_ids.add(job_id)
+            self._persist_queue.put(posting)
 
             self._wait_between_jobs(page)
 
-        if scraped < expected_on_page and len(collected) < self.max_jobs:
+        if skipped_known:
+            LOGGER.info("Skipped %d jobs already stored on this page.", skipped_known)
+        if scraped + skipped_known < expected_on_page and len(collected) < self.max_jobs:
             message = (
                 f"Only captured {scraped} jobs from current page"
                 + f"(expected {expected_on_page})."
@@ -297,15 +400,19 @@ class JobParserAgent:
             LOGGER.error(message)
             raise RuntimeError(message)
 
-        return scraped
+        return scraped + skipped_known
 
     def _locate_job_cards(self, page: Page) -> Locator:
+        # Search pages share one layout, so probe the selectors only until one matches.
+        if self._card_selector:
+            return page.locator(self._card_selector)
         selectors = self.config.selectors.get("job_cards") or [
             "[data-occludable-job-id]"
         ]
         for selector in selectors:
             locator = page.locator(selector)
             if locator.count() > 0:
+                self._card_selector = selector
                 return locator
         return page.locator("[data-job-id], [data-occludable-job-id]")
 
@@ -331,36 +438,41 @@ class JobParserAgent:
             return None
 
         try:
-            page.wait_for_selector("#job-details", timeout=self.wait_timeout * 1000)
-            page.wait_for_timeout(500)
+            page.wait_for_selector(
+                _DETAIL_SELECTOR, state="visible", timeout=self.wait_timeout * 1000
+            )
         except PlaywrightTimeoutError:
             LOGGER.debug("Timed out waiting for job details for %s.", job_id)
             return None
+        self._wait_for_detail_text(page)
 
-        detail_panel = page.locator("#job-details").first
+        try:
+            snapshot = card.evaluate(_CARD_SNAPSHOT_JS, self._snapshot_opts)
+        except (PlaywrightTimeoutError, PlaywrightError) as exc:
+            LOGGER.debug("Unable to read job details for %s: %s", job_id, exc)
+            return None
 
-        raw_title = (
-            self._extract_text(card, self.config.selectors.get("title", []))
-            or "Unknown Title"
+        title = self._clean_title(snapshot.get("title") or "Unknown Title")
+        company_url, slug = self._normalize_company_url(snapshot.get("companyHref"))
+        company_name = (
+            slug
+            or snapshot.get("companyLinkText")
+            or snapshot.get("companyText")
+            or "Unknown Company"
         )
-        title = self._clean_title(raw_title)
-        company_name, company_url = self._resolve_company_info(page, card, detail_panel)
-        if company_name is None:
-            company_name = (
-                self._extract_text(card, self.config.selectors.get("company", []))
-                or "Unknown Company"
-            )
-
-        try:
-            description = detail_panel.inner_text().strip()
-        except (PlaywrightTimeoutError, PlaywrightError):
-            LOGGER.debug("Unable to read description for %s.", job_id)
-            description = ""
 
-        recruiter_url = self._extract_recruiter_url(page)
-        salary_min, salary_max = self._extract_salary_range(page)
+        description = snapshot.get("description") or ""
+        recruiter_href = snapshot.get("recruiterHref")
+        recruiter_url = recruiter_href.split("?")[0] if recruiter_href else None
+        salary_min, salary_max = self._parse_salary_range(snapshot.get("salaryText") or "")
+        if salary_min is None:
+            salary_min, salary_max = self._parse_description_salary(description)
+        posting_time = None
+        for raw_time in snapshot.get("postingTimes") or []:
+            posting_time = self._parse_posting_time(raw_time)
+            if posting_time:
+                break
         apply_url = self._extract_apply_url(page)
-        posting_time = self._extract_posting_time(page)
 
         return JobPosting(
             job_id=job_id,
@@ -376,6 +488,22 @@ class JobParserAgent:
             url=f"https://www.linkedin.com/jobs/view/{job_id}/",
         )
 
+    @staticmethod
+    def _wait_for_detail_text(page: Page) -> None:
+        """Return once the detail panel's text length is stable across two polls."""
+        panel = page.locator(_DETAIL_SELECTOR).first
+        deadline = time.monotonic() + DETAIL_SETTLE_TIMEOUT_SECONDS
+        previous = -1
+        while time.monotonic() < deadline:
+            try:
+                length = panel.evaluate("el => el.innerText.length")
+            except (PlaywrightTimeoutError, PlaywrightError):
+                return
+            if length and length == previous:
+                return
+            previous = length
+            page.wait_for_timeout(DETAIL_POLL_SECONDS * 1000)
+
     def _extract_apply_url(self, page: Page) -> Optional[str]:
         """Click the apply button and capture the URL from the new tab."""
         try:
@@ -406,85 +534,56 @@ class JobParserAgent:
             LOGGER.debug("Failed to capture apply_url: %s", exc)
             return None
 
-    def _extract_salary_range(
-        self, page: Page
-    ) -> Tuple[Optional[float], Optional[float]]:
-        selector = (
-            ".job-details-fit-level-preferences > "
-            "button:nth-child(1) > span:nth-child(1) > strong:nth-child(1)"
-        )
-        locator = page.locator(selector).first
-        if locator.count() == 0:
-            return None, None
-        try:
-            text = locator.inner_text().strip()
-        except (PlaywrightTimeoutError, PlaywrightError):
-            return None, None
+    def _snapshot_options(self) -> Dict[str, object]:
+        selectors = self.config.selectors
+        return {
+            "detail": _DETAIL_SELECTOR,
+            "title": selectors.get("title", []),
+            "company": selectors.get("company", []),
+            "companyLinks": selectors.get("company_links") or [],
+            "companyScopes": list(_COMPANY_SCOPE_SELECTORS),
+            "recruiter": _RECRUITER_SELECTOR,
+            "salary": _SALARY_SELECTOR,
+            "postingTime": selectors.get("posting_time")
+            or list(_DEFAULT_POSTING_TIME_SELECTORS),
+        }
 
+    @staticmethod
+    def _parse_salary_range(text: str) -> Tuple[Optional[float], Optional[float]]:
         if not text:
             return None, None
+        return _first_two_amounts(_SALARY_RE, text.split("+")[0])
 
-        clean_text = text.split("+")[0]
-        matches = re.findall(r"\$?\s*([0-9]+(?:\.[0-9]+)?)([kKmM]?)", clean_text)
-        if not matches:
+    @staticmethod
+    def _parse_description_salary(description: str) -> Tuple[Optional[float], Optional[float]]:
+        """Find a "$150K - $200K" style range near the top of the description.
+
+        Only amounts in a plausible salary band count; a pair that is not ascending
+        (e.g. a base salary followed by a bonus) is rejected rather than guessed at.
+        """
+        amounts: List[float] = []
+        for match in _DESCRIPTION_SALARY_RE.finditer(
+            description[:DESCRIPTION_SALARY_SCAN_CHARS]
+        ):
+            amount = _to_amount(*match.groups())
+            if MIN_DESCRIPTION_SALARY <= amount <= MAX_DESCRIPTION_SALARY:
+                amounts.append(amount)
+                if len(amounts) == 2:
+                    break
+        if not amounts:
             return None, None
-
-        def to_number(value: str, suffix: str) -> float:
-            number = float(value)
-            suffix = suffix.lower()
-            if suffix == "m":
-                number *= 1_000_000
-            elif suffix == "k":
-                number *= 1_000
-            return number
-
-        min_value = to_number(*matches[0])
-        max_value = to_number(*matches[1]) if len(matches) > 1 else min_value
-        return min_value, max_value
-
-    def _extract_recruiter_url(self, page: Page) -> Optional[str]:
-        selector = (
-            ".job-details-people-who-can-help__section--two-pane > "
-            "div:nth-child(2) > div:nth-child(1) > a:nth-child(1)"
-        )
-        locator = page.locator(selector).first
-        if locator.count() == 0:
-            return None
-        try:
-            href = locator.get_attribute("href") or None
-        except (PlaywrightTimeoutError, PlaywrightError):
-            return None
-        if href:
-            return href.split("?")[0]
-        return None
-
-    def _extract_posting_time(self, page: Page) -> Optional[str]:
-        selectors = self.config.selectors.get("posting_time") or [
-            "div.mt2:nth-child(1) > span:nth-child(1) > span:nth-child(3)"
-        ]
-        for selector in selectors:
-            locator = page.locator(selector).first
-            if locator.count() == 0:
-                continue
-            try:
-                raw = locator.inner_text().strip()
-            except (PlaywrightTimeoutError, PlaywrightError):
-                continue
-            parsed = self._parse_posting_time(raw)
-            if parsed:
-                return parsed
-        return None
+        salary_min, salary_max = amounts[0], amounts[-1]
+        if salary_min > salary_max:
+            return None, None
+        return salary_min, salary_max
 
     @staticmethod
     def _parse_posting_time(raw: str) -> Optional[str]:
         if not raw:
             return None
-        normalized = re.sub(r"\s+", " ", raw).strip()
-        normalized = re.sub(r"^Reposted\s+", "", normalized, flags=re.IGNORECASE)
-        match = re.search(
-            r"(?i)(\d+)\s+(hour|hours|day|days|week|weeks|month|months)\s+ago",
-            normalized,
-        )
+        normalized = _WHITESPACE_RE.sub(" ", raw).strip()
+        normalized = _REPOSTED_RE.sub("", normalized)
+        match = _RELATIVE_TIME_RE.search(normalized)
         if not match:
             return None
 
@@ -503,71 +602,10 @@ class JobParserAgent:
         timestamp = datetime.now(timezone.utc) - delta
         return timestamp.isoformat()
 
-    def _resolve_company_info(
-        self,
-        page: Page,
-        card: Locator,
-        detail_panel: Locator,
-    ) -> Tuple[Optional[str], Optional[str]]:
-        scopes: List[Locator] = [
-            card,
-            detail_panel,
-            page.locator(".jobs-unified-top-card__primary-description"),
-            page.locator(".jobs-unified-top-card__content-container"),
-            page.locator(".jobs-unified-top-card__subtitle"),
-            page.locator(".jobs-details-top-card__company-url"),
-        ]
-
-        for scope in scopes:
-            name, url = self._extract_company_from_scope(scope)
-            if name or url:
-                return name, url
-
-        company_link_selectors = self.config.selectors.get("company_links") or []
-        if company_link_selectors:
-            fallback = page.locator(company_link_selectors[0]).first
-            if fallback.count() > 0:
-                return self._extract_company_from_link(fallback)
-        return None, None
-
-    def _extract_company_from_scope(
-        self, scope: Locator
-    ) -> Tuple[Optional[str], Optional[str]]:
-        if scope.count() == 0:
-            return None, None
-        company_link_selectors = self.config.selectors.get("company_links") or []
-        for selector in company_link_selectors:
-            link = scope.locator(selector).first
-            if link.count() == 0:
-                continue
-            name, url = self._extract_company_from_link(link)
-            if name or url:
-                return name, url
-        return None, None
-
-    def _extract_company_from_link(
-        self, link: Locator
-    ) -> Tuple[Optional[str], Optional[str]]:
-        href = None
-        try:
-            href = link.get_attribute("href") or None
-        except (PlaywrightTimeoutError, PlaywrightError):
-            href = None
-
-        normalized_url, slug = self._normalize_company_url(href)
-
-        link_text = None
-        try:
-            link_text = link.inner_text().strip() or None
-        except (PlaywrightTimeoutError, PlaywrightError):
-            link_text = None
-
-        name = slug or link_text
-        return name, normalized_url
-
-    def _normalize_company_url(
-        self, url: Optional[str]
-    ) -> Tuple[Optional[str], Optional[str]]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _normalize_company_url(url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        # Memoised on the raw href: many postings share the same company link.
         if not url:
             return None, None
 
@@ -582,52 +620,60 @@ class JobParserAgent:
         netloc = parsed.netloc or "www.linkedin.com"
         path_segments = [segment for segment in parsed.path.split("/") if segment]
 
-        slug: Optional[str] = None
-        if "company" in path_segments:
-            idx = path_segments.index("company")
-            if idx + 1 < len(path_segments):
-                slug = path_segments[idx + 1]
-                normalized_path = f"/company/{slug}/"
-                parsed = parsed._replace(
-                    path=normalized_path,
-                    params="",
-                    query="",
-                    fragment="",
-                )
-        else:
-            parsed = parsed._replace(params="", query="", fragment="")
-
-        normalized = urlunparse(
-            ParseResult(
-                scheme=scheme,
-                netloc=netloc,
-                path=parsed.path,
-                params="",
-                query="",
-                fragment="",
-            )
-        )
-
-        return normalized, slug
+        try:
+            slug = path_segments[path_segments.index("company") + 1]
+        except (ValueError, IndexError):
+            path = parsed.path
+            if path and not path.startswith("/"):
+                path = f"/{path}"
+            return f"{scheme}://{netloc}{path}", None
+        return f"{scheme}://{netloc}/company/{slug}/", slug
 
     @staticmethod
     def _clean_title(raw_title: str) -> str:
-        lines = [line.strip() for line in raw_title.splitlines() if line.strip()]
-        if not lines:
+        # dict.fromkeys dedupes while keeping first-seen order.
+        stripped = (line.strip() for line in raw_title.splitlines())
+        deduped = list(dict.fromkeys(line for line in stripped if line))
+        if not deduped:
             return raw_title.strip()
-        seen: set[str] = set()
-        deduped: List[str] = []
-        for line in lines:
-            if line not in seen:
-                deduped.append(line)
-                seen.add(line)
         if len(deduped) == 1:
             return deduped[0]
         return " ".join(deduped)
 
-    def _ensure_job_cards_loaded(self, page: Page, collected_so_far: int) -> int:
-        del collected_so_far
-        return self._locate_job_cards(page).count()
+    def _wait_for_cards(self, page: Page, started: Optional[float] = None) -> int:
+        """Wait until job cards are attached and their count has settled.
+
+        Replaces a fixed post-navigation sleep. Set ``SCRAPER_PAGE_DELAY_FLOOR=1``
+        to still honour ``page_delay_seconds`` as a minimum per page (rate limiting).
+        """
+        selectors = self.config.selectors.get("job_cards") or ["[data-occludable-job-id]"]
+        selector = ", ".join(selectors)
+        count = 0
+        try:
+            page.wait_for_selector(
+                selector, state="attached", timeout=self.wait_timeout * 1000
+            )
+        except PlaywrightTimeoutError:
+            LOGGER.debug("No job cards attached within timeout.")
+        else:
+            locator = page.locator(selector)
+            count = locator.count()
+            interval = CARD_POLL_INITIAL_SECONDS
+            deadline = time.monotonic() + CARD_SETTLE_TIMEOUT_SECONDS
+            stable_samples = 0
+            while stable_samples < 2 and time.monotonic() < deadline:
+                page.wait_for_timeout(interval * 1000)
+                current = locator.count()
+                stable_samples = stable_samples + 1 if current == count else 0
+                count = current
+                interval = min(interval * CARD_POLL_BACKOFF, CARD_POLL_MAX_SECONDS)
+
+        if os.environ.get("SCRAPER_PAGE_DELAY_FLOOR") == "1":
+            elapsed = time.monotonic() - started if started is not None else 0.0
+            remaining = self.config.page_delay_seconds - elapsed
+            if remaining > 0:
+                time.sleep(remaining)
+        return count
 
     def _wait_between_jobs(self, page: Page) -> None:
         per_job_delay = min(self.config.page_delay_seconds / 2, 1.5)
@@ -636,17 +682,20 @@ class JobParserAgent:
             page.wait_for_timeout(delay_ms)
 
     def _build_search_url(self, offset: int) -> str:
+        # Only the offset changes between pages; the rest is encoded once per base URL.
+        if self._search_url_parts is None:
+            self._search_url_parts = self._search_url_template()
+        prefix, suffix = self._search_url_parts
+        return f"{prefix}{offset}{suffix}"
+
+    def _search_url_template(self) -> Tuple[str, str]:
+        """Return the (prefix, suffix) surrounding the start offset in a search URL."""
         if self._base_search_parts:
             parsed_base = self._base_search_parts
             base_query = dict(self._base_query)
         else:
-            parsed_base = urlparse(self.config.base_url)
-            base_query = {
-                key: value
-                for key, value in parse_qsl(parsed_base.query)
-                if key != self.config.start_param
-            }
-            base_query.update(self.config.extra_params)
+            parsed_base = self._config_base_parts
+            base_query = dict(self._config_base_query)
 
         base_query["keywords"] = self.job_title
         base_query["origin"] = "JOB_SEARCH_PAGE_JOB_FILTER"
@@ -656,51 +705,90 @@ class JobParserAgent:
         else:
             base_query.pop("f_TPR", None)
 
-        params: Dict[str, str] = {
-            **base_query,
-            self.config.start_param: str(offset),
-        }
+        query = urlencode({**base_query, self.config.start_param: ""}, doseq=True)
+        prefix = urlunparse(parsed_base._replace(query=query, fragment=""))
+        suffix = f"#{parsed_base.fragment}" if parsed_base.fragment else ""
+        return prefix, suffix
+
+    def _persist_worker(self) -> None:
+        """Drain the persist queue into batched inserts until a None sentinel arrives."""
+        stopping = False
+        while not stopping:
+            batch: List[JobPosting] = []
+            item = self._persist_queue.get()
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= PERSIST_BATCH_SIZE:
+                    break
+                try:
+                    item = self._persist_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush_postings(batch)
+
+    def _flush_postings(self, batch: List[JobPosting]) -> None:
+        # Never let a batch end the worker: the producer would then block forever on
+        # the bounded queue. The error is kept and raised from run() after the join.
+        try:
+            inserted_ids = self._persist_jobs(batch)
+            for posting in batch:
+                self._log_captured(posting, posting.job_id in inserted_ids)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception("Failed to persist %d job postings.", len(batch))
+            if self._persist_error is None:
+                self._persist_error = exc
 
-        query = urlencode(params, doseq=True)
-        new_parts = ParseResult(
-            scheme=parsed_base.scheme,
-            netloc=parsed_base.netloc,
-            path=parsed_base.path,
-            params=parsed_base.params,
-            query=query,
-            fragment=parsed_base.fragment,
-        )
-        return urlunparse(new_parts)
+    def _persist_jobs(self, jobs: List[JobPosting]) -> Set[str]:
+        return insert_jobs(self._conn, [_job_row(job) for job in jobs])
 
-    def _extract_text(
-        self, locator: Locator, selectors: Iterable[str]
-    ) -> Optional[str]:
-        for selector in selectors:
-            try:
-                element = locator.locator(selector).first
-                if element.count() == 0:
-                    continue
-                text = element.inner_text().strip()
-                if text:
-                    return text
-            except PlaywrightTimeoutError:
-                continue
-        return None
+    @staticmethod
+    def _log_captured(posting: JobPosting, inserted: bool) -> None:
+        log_company = posting.company_url or posting.company
+        recruiter_log = posting.recruiter_url or "(no recruiter)"
+        posting_time_log = posting.posting_time or "-"
+        salary_log = "-"
+        if posting.salary_min is not None:
+            if posting.salary_max is not None and posting.salary_max != posting.salary_min:
+                salary_log = f"{int(posting.salary_min)}-{int(posting.salary_max)}"
+            else:
+                salary_log = f"{int(posting.salary_min)}"
 
-    def _persist_job(self, job: JobPosting) -> bool:
-        return insert_job_dataclass(self.database_path, job)
+        if inserted:
+            LOGGER.info(
+                "Captured job %s: %s @ %s recruiter: %s salary: %s posted: %s",
+                posting.job_id,
+                posting.title,
+                log_company,
+                recruiter_log,
+                salary_log,
+                posting_time_log,
+            )
+        else:
+            LOGGER.info(
+                "Captured job %s already stored @ %s recruiter: %s salary: %s posted: %s",
+                posting.job_id,
+                log_company,
+                recruiter_log,
+                salary_log,
+                posting_time_log,
+            )
 
     @staticmethod
     def _derive_job_id_from_url(url: str) -> Optional[str]:
         if not url:
             return None
-        match = re.search(r"/view/(\d+)", url)
+        match = _VIEW_ID_RE.search(url)
         if match:
             return match.group(1)
-        digits = re.findall(r"\d+", url)
-        return digits[0] if digits else None
+        digits = _DIGITS_RE.search(url)
+        return digits.group(0) if digits else None
 
     def _update_base_search_from_url(self, url: str) -> None:
+        self._search_url_parts = None
         parsed = urlparse(url)
         query_pairs = parse_qsl(parsed.query, keep_blank_values=True)
         self._base_search_parts = ParseResult(
@@ -734,6 +822,30 @@ class JobParserAgent:
                 self._base_query.setdefault(key, value)
 
 
+def _first_two_amounts(
+    pattern: re.Pattern[str], text: str
+) -> Tuple[Optional[float], Optional[float]]:
+    """Return (min, max) from the first two money matches; stops scanning after them."""
+    matches = pattern.finditer(text)
+    first = next(matches, None)
+    if first is None:
+        return None, None
+    second = next(matches, None)
+    min_value = _to_amount(*first.groups())
+    max_value = _to_amount(*second.groups()) if second else min_value
+    return min_value, max_value
+
+
+def _to_amount(value: str, suffix: str) -> float:
+    number = float(value.replace(",", ""))
+    suffix = suffix.lower()
+    if suffix == "m":
+        number *= 1_000_000
+    elif suffix == "k":
+        number *= 1_000
+    return number
+
+
 def _configure_logging(log_level: Optional[str]) -> None:
     """Configure module logging."""
     level = logging.INFO
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import logging
 import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
-from playwright.sync_api import Browser, BrowserContext, Page
+from playwright.sync_api import Browser, BrowserContext, Page, Route
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
@@ -23,10 +25,12 @@ class Credentials:
 def load_credentials(login_file: Path = Path("secure/login.txt")) -> Credentials:
     """Load credentials from the given login file."""
 
-    if not login_file.exists():
-        raise FileNotFoundError(f"Login file not found at {login_file}")
+    try:
+        mtime_ns = login_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Login file not found at {login_file}") from None
 
-    username, password = _read_login_file(login_file)
+    username, password = _read_login_file(str(login_file), mtime_ns)
     if not username or not password:
         raise ValueError(
             f"Login file {login_file} must contain username and password on separate lines."
@@ -35,12 +39,12 @@ def load_credentials(login_file: Path = Path("secure/login.txt")) -> Credentials
     return Credentials(username=username, password=password)
 
 
-def _read_login_file(login_file: Path) -> Tuple[Optional[str], Optional[str]]:
-    with login_file.open("r", encoding="utf-8") as handle:
-        lines = [line.strip() for line in handle.readlines()]
-
-    username = lines[0] if len(lines) >= 1 and lines[0] else None
-    password = lines[1] if len(lines) >= 2 and lines[1] else None
+@lru_cache(maxsize=4)
+def _read_login_file(path_str: str, mtime_ns: int) -> Tuple[Optional[str], Optional[str]]:
+    # mtime_ns only keys the cache so a rewritten file is read again.
+    with open(path_str, "r", encoding="utf-8") as handle:
+        username = handle.readline().strip() or None
+        password = handle.readline().strip() or None
     return username, password
 
 
@@ -48,7 +52,12 @@ LOGIN_URL = "https://www.linkedin.com/login"
 FEED_URL = "https://www.linkedin.com/feed/"
 DEFAULT_LOGIN_FILE = Path("secure/login.txt")
 DEFAULT_SESSION_FILE = Path("secure/session.json")
+SESSION_FRESH_SECONDS = 1800
 LOGGER = logging.getLogger(__name__)
+CONTEXT_OPTIONS = {"viewport": {"width": 1280, "height": 900}, "java_script_enabled": True}
+# The scraper only reads DOM text; stylesheets stay so visibility-based waits still work.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_LOGIN_URL_RE = re.compile(r"linkedin\.com/(feed|jobs|search)")
 
 
 def login_to_linkedin(
@@ -61,25 +70,49 @@ def login_to_linkedin(
     """Return an authenticated Playwright context/page, reusing cached storage when possible."""
 
     storage_kwargs = {}
-    if storage_path.exists():
+    storage_fresh = False
+    try:
+        storage_age = time.time() - storage_path.stat().st_mtime
+    except FileNotFoundError:
+        pass
+    else:
         storage_kwargs["storage_state"] = storage_path.as_posix()
+        storage_fresh = storage_age < SESSION_FRESH_SECONDS
 
-    context = browser.new_context(**storage_kwargs)
-    page = context.new_page()
-
-    if _session_active(page, wait_timeout):
-        LOGGER.info(
-            "Reusing cached LinkedIn session from %s.",
-            storage_kwargs.get("storage_state", "memory"),
-        )
+    context = browser.new_context(**CONTEXT_OPTIONS, **storage_kwargs)
+    try:
+        context.route("**/*", _block_heavy_resources)
+        page = context.new_page()
+
+        if storage_fresh:
+            # A session saved this recently is almost certainly valid; skip the feed probe.
+            LOGGER.info("Reusing recently stored LinkedIn session from %s.", storage_path)
+            return context, page
+
+        if _session_active(page, wait_timeout):
+            LOGGER.info(
+                "Reusing cached LinkedIn session from %s.",
+                storage_kwargs.get("storage_state", "memory"),
+            )
+            return context, page
+
+        LOGGER.info("LinkedIn session invalid or missing; performing login.")
+        _perform_login(page, wait_timeout=wait_timeout, login_file=login_file)
+        storage_path.parent.mkdir(parents=True, exist_ok=True)
+        context.storage_state(path=storage_path.as_posix())
+        LOGGER.info("Stored LinkedIn session to %s.", storage_path)
         return context, page
+    except BaseException:
+        # The caller only owns the context once we return it.
+        context.close()
+        raise
+
 
-    LOGGER.info("LinkedIn session invalid or missing; performing login.")
-    _perform_login(page, wait_timeout=wait_timeout, login_file=login_file)
-    storage_path.parent.mkdir(parents=True, exist_ok=True)
-    context.storage_state(path=storage_path.as_posix())
-    LOGGER.info("Stored LinkedIn session to %s.", storage_path)
-    return context, page
+def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
 
 
 def _session_active(page: Page, wait_timeout: float) -> bool:
@@ -105,23 +138,15 @@ def _perform_login(
     page.goto(LOGIN_URL, wait_until="domcontentloaded")
     page.fill("input#username", creds.username)
     page.fill("input#password", creds.password)
+    # One wait covers the submit navigation and any redirects up to feed/jobs/search.
     try:
-        with page.expect_navigation(wait_until="domcontentloaded", timeout=wait_timeout * 1000):
+        with page.expect_navigation(
+            url=_LOGIN_URL_RE, wait_until="domcontentloaded", timeout=wait_timeout * 1000
+        ):
             page.click("button[type='submit']")
-    except PlaywrightTimeoutError:
-        LOGGER.debug(
-            "Navigation did not complete during login submit; continuing with current page."
-        )
-
-    try:
-        page.wait_for_url(
-            re.compile(r"linkedin\\.com/(feed|jobs|search)"), timeout=wait_timeout * 1000
-        )
     except PlaywrightTimeoutError:
         LOGGER.debug("Login redirect did not reach feed/search within timeout.")
 
-    page.wait_for_load_state("domcontentloaded")
-
     if "login" in page.url:
         LOGGER.warning(
             "Still on login page after attempting to authenticate. Check credentials or MFA status."
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 from ..agents import (
@@ -15,10 +16,8 @@ from ..agents import (
 )
 from ..agents.tailor import tailor_resume_agentic
 from ..sql import (
+    fetch_agent_records,
     fetch_job_with_score,
-    fetch_latest_outreach_message,
-    fetch_latest_resume_version,
-    fetch_resume_versions,
     fetch_resume_version,
     delete_resume_versions,
     set_preferred_resume_version,
@@ -27,7 +26,10 @@ from ..sql import (
 )
 from .config import get_database_path as server_db_path
 
+# Handlers are plain ``def``: they block on SQLite and LLM calls, so Starlette runs
+# them in its worker thread pool instead of on the event loop.
 router = APIRouter(prefix="/agents", tags=["agents"])
+FILE_CACHE_CONTROL = "private, max-age=60"
 
 
 class InstructionPayload(BaseModel):
@@ -68,27 +70,29 @@ class ClearResponse(BaseModel):
 
 
 @router.get("/{job_key}", response_model=AgentStateResponse)
-async def get_agent_state(job_key: str) -> AgentStateResponse:
+def get_agent_state(job_key: str) -> AgentStateResponse:
     db_path = server_db_path()
     job = _load_job(job_key, db_path)
     job_key_value = job["job_key"]
     preferred_version = job.get("preferred_resume_version_id")
 
-    resume_variant = fetch_latest_resume_version(db_path, job_key_value)
-    resume_versions = fetch_resume_versions(db_path, job_key_value, limit=50)
-    outreach = fetch_latest_outreach_message(db_path, job_key_value)
+    resume_versions, outreach = fetch_agent_records(db_path, job_key_value, version_limit=50)
+    existing = _existing_files(resume_versions)
+    serialized = [
+        rv
+        for rv in (_serialize_resume(item, preferred_version, existing) for item in resume_versions)
+        if rv
+    ]
 
     return AgentStateResponse(
-        resume_variant=_serialize_resume(resume_variant, preferred_version),
-        resume_versions=[
-            rv for rv in (_serialize_resume(item, preferred_version) for item in resume_versions) if rv
-        ],
+        resume_variant=serialized[0] if serialized else None,
+        resume_versions=serialized,
         outreach=_serialize_outreach(outreach),
     )
 
 
 @router.post("/{job_key}/tailor-resume", response_model=ResumeVariantResponse)
-async def trigger_resume_tailoring(job_key: str, payload: InstructionPayload) -> ResumeVariantResponse:
+def trigger_resume_tailoring(job_key: str, payload: InstructionPayload) -> ResumeVariantResponse:
     db_path = server_db_path()
     job = _load_job(job_key, db_path)
     try:
@@ -117,7 +121,7 @@ async def trigger_resume_tailoring(job_key: str, payload: InstructionPayload) ->
 
 
 @router.post("/{job_key}/outreach", response_model=OutreachResponse)
-async def trigger_outreach(job_key: str, payload: InstructionPayload) -> OutreachResponse:
+def trigger_outreach(job_key: str, payload: InstructionPayload) -> OutreachResponse:
     db_path = server_db_path()
     job = _load_job(job_key, db_path)
     resume_text = load_master_resume_text()
@@ -144,7 +148,7 @@ async def trigger_outreach(job_key: str, payload: InstructionPayload) -> Outreac
 
 
 @router.post("/{job_key}/resume/preferred", response_model=ResumeVariantResponse)
-async def set_preferred_resume(job_key: str, payload: PreferredPayload) -> ResumeVariantResponse:
+def set_preferred_resume(job_key: str, payload: PreferredPayload) -> ResumeVariantResponse:
     db_path = server_db_path()
     job = _load_job(job_key, db_path)
     record = fetch_resume_version(db_path, payload.version_id)
@@ -157,7 +161,7 @@ async def set_preferred_resume(job_key: str, payload: PreferredPayload) -> Resum
 
 
 @router.post("/{job_key}/resume/clear", response_model=ClearResponse)
-async def clear_resume_versions(job_key: str) -> ClearResponse:
+def clear_resume_versions(job_key: str) -> ClearResponse:
     db_path = server_db_path()
     _load_job(job_key, db_path)  # validate job exists
     cleared = delete_resume_versions(db_path, job_key)
@@ -165,34 +169,51 @@ async def clear_resume_versions(job_key: str) -> ClearResponse:
 
 
 @router.get("/{job_key}/resume/{version_id}/pdf")
-async def download_tailored_resume_pdf(job_key: str, version_id: str):
+def download_tailored_resume_pdf(request: Request, job_key: str, version_id: str):
     db_path = server_db_path()
     record = fetch_resume_version(db_path, version_id)
     if not record or record["job_key"] != job_key:
         raise HTTPException(status_code=404, detail="Version not found")
-    pdf_path = Path(record["pdf_path"])
-    if not pdf_path.exists():
-        raise HTTPException(status_code=404, detail="PDF not found on disk")
-    return FileResponse(
-        path=pdf_path,
-        media_type="application/pdf",
-        filename=pdf_path.name,
+    return _cached_file_response(
+        request, Path(record["pdf_path"]), "application/pdf", "PDF not found on disk"
     )
 
 
 @router.get("/{job_key}/resume/{version_id}/tex")
-async def download_tailored_resume_tex(job_key: str, version_id: str):
+def download_tailored_resume_tex(request: Request, job_key: str, version_id: str):
     db_path = server_db_path()
     record = fetch_resume_version(db_path, version_id)
     if not record or record["job_key"] != job_key:
         raise HTTPException(status_code=404, detail="Version not found")
-    tex_path = Path(record["tex_path"])
-    if not tex_path.exists():
-        raise HTTPException(status_code=404, detail="TeX not found on disk")
+    return _cached_file_response(
+        request, Path(record["tex_path"]), "application/x-tex", "TeX not found on disk"
+    )
+
+
+def _cached_file_response(
+    request: Request, path: Path, media_type: str, missing_detail: str
+) -> Response:
+    """Serve a version file with a stat-derived ETag, answering 304 when it still matches.
+
+    Versions are write-once, so a reload revalidates instead of re-downloading.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=missing_detail) from None
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": FILE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }:
+        return Response(status_code=304, headers=headers)
     return FileResponse(
-        path=tex_path,
-        media_type="application/x-tex",
-        filename=tex_path.name,
+        path=path,
+        media_type=media_type,
+        filename=path.name,
+        headers=headers,
+        stat_result=stat,
     )
 
 
@@ -203,19 +224,47 @@ def _load_job(job_key: str, db_path):
     return job
 
 
-def _serialize_resume(record: Optional[dict], preferred_version: Optional[str] = None) -> Optional[ResumeVariantResponse]:
+def _existing_files(records: List[dict]) -> Set[str]:
+    """List each directory holding version files once instead of stat-ing every file."""
+    directories = {
+        str(Path(record[key]).parent)
+        for record in records
+        for key in ("pdf_path", "tex_path")
+        if record.get(key)
+    }
+    existing: Set[str] = set()
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                existing.update(str(Path(directory, entry.name)) for entry in entries)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return existing
+
+
+def _file_exists(raw_path: Optional[str], existing: Optional[Set[str]]) -> bool:
+    if not raw_path:
+        return False
+    path = Path(raw_path)
+    return str(path) in existing if existing is not None else path.exists()
+
+
+def _serialize_resume(
+    record: Optional[dict],
+    preferred_version: Optional[str] = None,
+    existing: Optional[Set[str]] = None,
+) -> Optional[ResumeVariantResponse]:
+    """Build the response model; ``existing`` (from _existing_files) avoids per-file stats."""
     if not record:
         return None
-    pdf_path = Path(record["pdf_path"]) if record.get("pdf_path") else None
-    tex_path = Path(record["tex_path"]) if record.get("tex_path") else None
     pdf_url = (
         f"/agents/{record['job_key']}/resume/{record['version_id']}/pdf"
-        if pdf_path and pdf_path.exists()
+        if _file_exists(record.get("pdf_path"), existing)
         else None
     )
     tex_url = (
         f"/agents/{record['job_key']}/resume/{record['version_id']}/tex"
-        if tex_path and tex_path.exists()
+        if _file_exists(record.get("tex_path"), existing)
         else None
     )
     return ResumeVariantResponse(
@@ -2,18 +2,37 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import gzip
+import hashlib
 import html
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
+import orjson
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-
-from ..sql import ensure_schema, fetch_job_with_score, fetch_jobs_with_scores
+from pydantic import BaseModel, TypeAdapter
+
+from ..ranking.embedding_utils import warm_up_embedding_model
+from ..sql import (
+    count_jobs,
+    ensure_schema,
+    fetch_job_with_score,
+    fetch_jobs_page,
+    fetch_jobs_version,
+)
 from .agent_routes import router as agent_router
 from .extension_routes import router as extension_router
-from .config import get_database_path
+from .config import get_database_path, get_warmup_embedding_model
 from .schemas import (
     DateFilter,
     JobDetailResponse,
@@ -24,12 +43,80 @@ from .schemas import (
 )
 
 PAGE_SIZE = 20
+# Tailoring/outreach requests hold a worker thread for the whole LLM exchange.
+THREADPOOL_SIZE = 64
 TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+# Counts are revalidated against the jobs version; the TTL bounds staleness from score
+# changes, which the search filter also matches but which do not bump the version.
+COUNT_CACHE_TTL_SECONDS = 30.0
+COUNT_CACHE_MAX_ENTRIES = 256
+LOGGER = logging.getLogger(__name__)
+JOB_KEY_PLACEHOLDER = "{{JOB_KEY}}"
+
+# Templates ship with the package, so read them once; a missing file fails at import.
+_TEMPLATES = {
+    name: (TEMPLATE_DIR / name).read_text(encoding="utf-8")
+    for name in ("index.html", "job_detail.html", "tailor.html", "outreach.html")
+}
+# Pre-split and pre-encoded, so rendering is a bytes join instead of a scan plus encode.
+_TEMPLATE_PARTS = {
+    name: tuple(part.encode("utf-8") for part in template.split(JOB_KEY_PLACEHOLDER))
+    for name, template in _TEMPLATES.items()
+}
+# HTML is compressed once (index) or once per key (job pages) rather than per request:
+# the pages are several KB of markup that gzip shrinks several-fold.
+GZIP_LEVEL = 9
+PAGE_CACHE_SIZE = 1024
+# A job's page shell depends only on its key, so browsers may reuse it briefly and
+# then revalidate; job JSON reflects live rows, so it is always revalidated.
+PAGE_CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=300"
+JSON_CACHE_CONTROL = "no-cache"
+_VARY_HEADERS = {"vary": "accept-encoding"}
+_GZIP_HEADERS = {"content-encoding": "gzip", "vary": "accept-encoding"}
+# The landing page takes no parameters; one response (body and headers) serves every hit.
+_INDEX_RESPONSE = HTMLResponse(_TEMPLATES["index.html"], headers=_VARY_HEADERS)
+_INDEX_GZIP_RESPONSE = HTMLResponse(
+    gzip.compress(_TEMPLATES["index.html"].encode("utf-8"), GZIP_LEVEL, mtime=0),
+    headers=_GZIP_HEADERS,
+)
+# Validates a whole page of rows in one pydantic-core call.
+_JOB_SUMMARIES = TypeAdapter(List[JobSummary])
+# (search, posted_within_days) -> (jobs version, total, expires_at)
+_COUNT_CACHE: Dict[Tuple[Optional[str], Optional[int]], Tuple[int, int, float]] = {}
 
 # Ensure database schema (including new agent tables) exists when server starts.
 ensure_schema(get_database_path())
 
-app = FastAPI(title="AI Job Assistant", version="0.2.0")
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    # The limiter lives on the running event loop, so it can only be resized here.
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    model_name = get_warmup_embedding_model()
+    if model_name:
+        # Loading takes seconds; do it off the startup path so the server accepts
+        # requests immediately and the first embedding call finds a warm model.
+        threading.Thread(
+            target=_warm_up_embeddings, args=(model_name,), name="embedding-warmup", daemon=True
+        ).start()
+    yield
+
+
+def _warm_up_embeddings(model_name: str) -> None:
+    try:
+        warm_up_embedding_model(model_name)
+    except Exception as exc:  # warmup is best effort; the first real call retries the load
+        LOGGER.warning("Embedding model warmup for %s failed: %s", model_name, exc)
+    else:
+        LOGGER.info("Embedding model %s warmed up.", model_name)
+
+
+app = FastAPI(
+    title="AI Job Assistant",
+    version="0.2.0",
+    lifespan=_lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -42,7 +129,7 @@ app.include_router(extension_router)
 
 
 @app.get("/all", response_model=JobListResponse)
-async def list_jobs(
+def list_jobs(
     page: int = Query(1, ge=1),
     sort_by: SortField = Query(SortField.score),
     order: SortOrder = Query(SortOrder.desc),
@@ -50,69 +137,87 @@ async def list_jobs(
     posted_within: DateFilter = Query(
         DateFilter.any, description="Restrict results by posting recency."
     ),
-) -> JobListResponse:
+    cursor: str | None = Query(
+        None, description="next_cursor from the previous page; takes precedence over page."
+    ),
+) -> Response:
     """Return paginated job summaries with score metadata."""
 
-    jobs_raw, total = fetch_jobs_with_scores(
+    after = _decode_cursor(cursor, sort_by, order) if cursor else None
+    posted_within_days = _date_filter_days(posted_within)
+    jobs_raw, next_after = fetch_jobs_page(
         get_database_path(),
         page,
         PAGE_SIZE,
         sort_by.value,
         order.value,
         search,
-        _date_filter_days(posted_within),
+        posted_within_days,
+        after=after,
     )
-
-    summaries: List[JobSummary] = [JobSummary(**job) for job in jobs_raw]
-    return JobListResponse(
-        page=page,
-        page_size=PAGE_SIZE,
-        total=total,
-        jobs=summaries,
+    total = _cached_job_count(search, posted_within_days)
+
+    summaries = _JOB_SUMMARIES.validate_python(jobs_raw)
+    return _model_response(
+        JobListResponse(
+            page=page,
+            page_size=PAGE_SIZE,
+            total=total,
+            jobs=summaries,
+            next_cursor=_encode_cursor(sort_by, order, next_after) if next_after else None,
+        )
     )
 
 
 @app.get("/job/{job_key}", response_model=JobDetailResponse)
-async def job_detail(job_key: str) -> JobDetailResponse:
-    """Return the job posting (and scores) for the given identifier."""
+def job_detail(request: Request, job_key: str) -> Response:
+    """Return the job posting (and scores) for the given identifier.
+
+    The ETag hashes the serialized body, so a matching revalidation gets an empty 304.
+    """
 
     record = fetch_job_with_score(get_database_path(), job_key)
     if not record:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return JobDetailResponse(**record)
+    body = JobDetailResponse(**record).model_dump_json().encode("utf-8")
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": JSON_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index_page() -> HTMLResponse:
+async def index_page(request: Request) -> HTMLResponse:
     """Serve the minimal Alpine-driven job table."""
 
-    return HTMLResponse(_render_index_page())
+    return _INDEX_GZIP_RESPONSE if _accepts_gzip(request) else _INDEX_RESPONSE
 
 
 @app.get("/jobs/{job_key}", response_class=HTMLResponse)
-async def job_page(job_key: str) -> HTMLResponse:
+async def job_page(request: Request, job_key: str) -> HTMLResponse:
     """Serve the job detail scaffold."""
 
-    return HTMLResponse(_render_job_detail_page(job_key))
+    return _page_response(request, "job_detail.html", job_key)
 
 
 @app.get("/jobs/{job_key}/tailor", response_class=HTMLResponse)
-async def tailor_resume_page(job_key: str) -> HTMLResponse:
+async def tailor_resume_page(request: Request, job_key: str) -> HTMLResponse:
     """Serve the dedicated resume tailoring page."""
 
-    return HTMLResponse(_render_tailor_page(job_key))
+    return _page_response(request, "tailor.html", job_key)
 
 
 @app.get("/jobs/{job_key}/outreach", response_class=HTMLResponse)
-async def outreach_page(job_key: str) -> HTMLResponse:
+async def outreach_page(request: Request, job_key: str) -> HTMLResponse:
     """Serve the dedicated outreach page."""
 
-    return HTMLResponse(_render_outreach_page(job_key))
+    return _page_response(request, "outreach.html", job_key)
 
 
 @app.get("/jobs/{job_key}/apply")
-async def apply_redirect(job_key: str):
+def apply_redirect(job_key: str):
     """Redirect to the job's apply URL if available."""
 
     record = fetch_job_with_score(get_database_path(), job_key)
@@ -121,43 +226,102 @@ async def apply_redirect(job_key: str):
     return RedirectResponse(url=record["apply_url"])
 
 
-def _render_index_page() -> str:
-    """Return the HTML for the landing page."""
+def _model_response(model: BaseModel) -> Response:
+    """Serialize an already-validated model once, in pydantic-core.
+
+    Returning a Response skips FastAPI's response_model re-validation; the declared
+    response_model still documents the route.
+    """
+
+    return Response(model.model_dump_json(), media_type="application/json")
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+
+
+def _page_response(request: Request, template: str, job_key: str) -> Response:
+    """Return a per-job page, gzipped when the client accepts it.
+
+    A matching If-None-Match gets a 304 before anything is rendered or compressed.
+    """
+
+    gzipped = _accepts_gzip(request)
+    headers = dict(_GZIP_HEADERS if gzipped else _VARY_HEADERS)
+    etag = _page_etag(template, job_key)
+    # Each encoding is a different representation, so it needs its own strong tag.
+    headers["ETag"] = f'"{etag}-gz"' if gzipped else f'"{etag}"'
+    headers["Cache-Control"] = PAGE_CACHE_CONTROL
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if gzipped:
+        return HTMLResponse(_gzipped_page(template, job_key), headers=headers)
+    return HTMLResponse(_render_page(template, job_key), headers=headers)
+
+
+def _render_page(template: str, job_key: str) -> bytes:
+    """Return the encoded HTML of ``template`` for one job."""
+
+    return html.escape(job_key).encode("utf-8").join(_TEMPLATE_PARTS[template])
+
 
-    return _read_template("index.html")
+@lru_cache(maxsize=PAGE_CACHE_SIZE)
+def _page_etag(template: str, job_key: str) -> str:
+    return hashlib.blake2b(_render_page(template, job_key), digest_size=16).hexdigest()
 
 
-def _render_job_detail_page(job_key: str) -> str:
-    """Return the HTML for a single job detail page."""
+@lru_cache(maxsize=PAGE_CACHE_SIZE)
+def _gzipped_page(template: str, job_key: str) -> bytes:
+    return gzip.compress(_render_page(template, job_key), GZIP_LEVEL, mtime=0)
 
-    safe_job_key = html.escape(job_key)
-    template = _read_template("job_detail.html")
-    return template.replace("{{JOB_KEY}}", safe_job_key)
 
+def _cached_job_count(search: Optional[str], posted_within_days: Optional[int]) -> int:
+    """Return the filtered job count, recounting only when stale or the jobs changed."""
 
-def _render_tailor_page(job_key: str) -> str:
-    """Return the HTML for the resume tailoring page."""
+    database_path = get_database_path()
+    key = ((search or "").strip() or None, posted_within_days)
+    version = fetch_jobs_version(database_path)
+    now = time.monotonic()
+    cached = _COUNT_CACHE.get(key)
+    if cached is not None and cached[0] == version and cached[2] > now:
+        return cached[1]
 
-    safe_job_key = html.escape(job_key)
-    template = _read_template("tailor.html")
-    return template.replace("{{JOB_KEY}}", safe_job_key)
+    total = count_jobs(database_path, search, posted_within_days)
+    if len(_COUNT_CACHE) >= COUNT_CACHE_MAX_ENTRIES:
+        _COUNT_CACHE.clear()
+    _COUNT_CACHE[key] = (version, total, now + COUNT_CACHE_TTL_SECONDS)
+    return total
 
 
-def _render_outreach_page(job_key: str) -> str:
-    """Return the HTML for the outreach page."""
+def _encode_cursor(sort_by: SortField, order: SortOrder, after: Tuple[Any, int]) -> str:
+    """Pack the last row's sort key into an opaque, URL-safe cursor."""
 
-    safe_job_key = html.escape(job_key)
-    template = _read_template("outreach.html")
-    return template.replace("{{JOB_KEY}}", safe_job_key)
+    payload = orjson.dumps([sort_by.value, order.value, *after])
+    return base64.urlsafe_b64encode(payload).decode("ascii")
 
 
-def _read_template(name: str) -> str:
-    """Load an HTML template from disk."""
+def _decode_cursor(cursor: str, sort_by: SortField, order: SortOrder) -> Tuple[Any, int]:
+    """Unpack a cursor, rejecting ones issued for a different sort."""
 
-    path = TEMPLATE_DIR / name
-    if not path.exists():
-        raise FileNotFoundError(f"Missing template: {path}")
-    return path.read_text(encoding="utf-8")
+    try:
+        cursor_sort, cursor_order, value, row_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if (
+        cursor_sort != sort_by.value
+        or cursor_order != order.value
+        or not isinstance(row_id, int)
+        or not (value is None or isinstance(value, (str, int, float)))
+    ):
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort")
+    return value, row_id
 
 
 def _date_filter_days(date_filter: DateFilter) -> int | None:
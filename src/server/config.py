@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 DEFAULT_DB_PATH = Path(os.environ.get("JOB_ASSISTANT_DB", "data/jobs.db"))
 
@@ -14,3 +15,9 @@ def get_database_path() -> Path:
     """Return the SQLite database path (cached)."""
 
     return Path(os.environ.get("JOB_ASSISTANT_DB", DEFAULT_DB_PATH))
+
+
+def get_warmup_embedding_model() -> Optional[str]:
+    """Return the embedding model to preload at startup, or None to skip warmup."""
+
+    return os.environ.get("JOB_ASSISTANT_EMBEDDING_MODEL") or None
@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from ..agents.gemini import generate_gemini_content
-from ..sql import fetch_job_with_score
+from ..sql import (
+    fetch_job_by_host,
+    fetch_job_with_score,
+    fetch_resume_version,
+    fetch_resume_versions,
+)
 from .config import get_database_path
 
 router = APIRouter(prefix="/extension", tags=["extension"])
@@ -26,6 +36,12 @@ if not logger.handlers:
 logger.setLevel(logging.DEBUG)
 
 PERSONAL_PATH = Path("data/personal.json")
+# The extension re-scans forms as the DOM changes; identical scans reuse one LLM mapping.
+AUTOFILL_CACHE_TTL_SECONDS = 60.0
+AUTOFILL_CACHE_MAX_ENTRIES = 256
+_AUTOFILL_CACHE: Dict[str, Tuple[float, Dict[str, str]]] = {}
+_AUTOFILL_INFLIGHT: Dict[str, Future] = {}
+_AUTOFILL_LOCK = threading.Lock()
 
 
 class FieldDescriptor(BaseModel):
@@ -57,11 +73,20 @@ class AutofillResponse(BaseModel):
 
 
 def _load_personal() -> Dict[str, str]:
-    if not PERSONAL_PATH.exists():
+    """Return personal.json; an unchanged file costs a single stat()."""
+    try:
+        mtime_ns = PERSONAL_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
+    return _read_personal(str(PERSONAL_PATH), mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _read_personal(path_str: str, mtime_ns: int) -> Dict[str, str]:
+    # mtime_ns only keys the cache so an edited file is parsed again.
     try:
-        return json.loads(PERSONAL_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        return orjson.loads(Path(path_str).read_bytes())
+    except orjson.JSONDecodeError:
         return {}
 
 
@@ -72,48 +97,39 @@ def _allowed_host(url: str) -> bool:
 
 def _match_job_by_url(target_url: str) -> Optional[dict]:
     """Best-effort match job by domain against apply_url or url."""
-    parsed_target = urlparse(target_url)
-    target_host = parsed_target.netloc.lower()
-    db_path = get_database_path()
-    # fetch a small set of candidates
-    conn = None
-    try:
-        import sqlite3
-
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(
-            """
-            SELECT job_id, url, apply_url
-            FROM job_postings
-            WHERE apply_url IS NOT NULL OR url IS NOT NULL
-            """
-        ).fetchall()
-        for row in rows:
-            for candidate in [row["apply_url"], row["url"]]:
-                if not candidate:
-                    continue
-                host = urlparse(candidate).netloc.lower()
-                if host and host in target_host:
-                    return dict(row)
-    finally:
-        if conn:
-            conn.close()
-    return None
+    target_host = urlparse(target_url).netloc.lower()
+    if not target_host:
+        return None
+    # A job matches on the page's host or any parent domain (jobs.acme.com -> acme.com).
+    labels = target_host.split(".")
+    hosts = [".".join(labels[index:]) for index in range(len(labels))]
+    return fetch_job_by_host(get_database_path(), hosts)
+
+
+_PROMPT_PREAMBLE = (
+    b"You fill a job application form using ONLY the provided personal data. "
+    b"Return ONLY a JSON object mapping field_id to value. "
+    b"No code fences, no prefixes, no markdown, no text before or after. "
+    b"If a field cannot be filled, omit it. Do not invent new information.\n\n"
+    b"Personal data (JSON):\n"
+)
+_PROMPT_FIELDS_HEADER = b"\n\nRequested fields (JSON array):\n"
+_PROMPT_SUFFIX = b"\n\nRespond with the JSON object only."
+# Serializes the whole field list in pydantic-core rather than one model_dump per field.
+_FIELDS_ADAPTER = TypeAdapter(List[FieldDescriptor])
 
 
 def _build_prompt(personal: Dict[str, str], fields: List[FieldDescriptor]) -> str:
-    return (
-        "You fill a job application form using ONLY the provided personal data. "
-        "Return ONLY a JSON object mapping field_id to value. "
-        "No code fences, no prefixes, no markdown, no text before or after. "
-        "If a field cannot be filled, omit it. Do not invent new information.\n\n"
-        "Personal data (JSON):\n"
-        f"{json.dumps(personal, ensure_ascii=False)}\n\n"
-        "Requested fields (JSON array):\n"
-        f"{json.dumps([field.dict() for field in fields], ensure_ascii=False)}\n\n"
-        "Respond with the JSON object only."
-    )
+    # Both payloads are encoded straight to UTF-8 bytes; the prompt is decoded once.
+    return b"".join(
+        (
+            _PROMPT_PREAMBLE,
+            orjson.dumps(personal),
+            _PROMPT_FIELDS_HEADER,
+            _FIELDS_ADAPTER.dump_json(fields),
+            _PROMPT_SUFFIX,
+        )
+    ).decode("utf-8")
 
 
 def _run_llm_mapping(personal: Dict[str, str], fields: List[FieldDescriptor]) -> Dict[str, str]:
@@ -133,17 +149,69 @@ def _run_llm_mapping(personal: Dict[str, str], fields: List[FieldDescriptor]) ->
         raw = parts[1] if len(parts) >= 2 else raw
     raw = raw.strip()
     try:
-        parsed = json.loads(raw)
+        parsed = orjson.loads(raw)
         if isinstance(parsed, dict):
             return {str(k): str(v) for k, v in parsed.items() if v is not None}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.debug("LLM mapping returned non-JSON: %s", raw[:500])
         return {}
     return {}
 
 
+def _autofill_cache_key(
+    url: str, personal: Dict[str, str], fields: List[FieldDescriptor]
+) -> str:
+    # Hash everything the prompt sees, not just field ids: forms sharing ids but
+    # differing in labels, types or options must not get each other's answers, and an
+    # edited personal.json must not be answered from the old values.
+    described = sorted(
+        orjson.dumps(field.model_dump(), option=orjson.OPT_SORT_KEYS) for field in fields
+    )
+    digest = hashlib.sha1(urlparse(url).netloc.lower().encode("utf-8"))
+    digest.update(b"\0" + orjson.dumps(personal, option=orjson.OPT_SORT_KEYS))
+    for entry in described:
+        digest.update(b"\0" + entry)
+    return digest.hexdigest()
+
+
+def _cached_llm_mapping(
+    url: str, personal: Dict[str, str], fields: List[FieldDescriptor]
+) -> Dict[str, str]:
+    """Map fields via the LLM, sharing results across repeated and concurrent scans.
+
+    Concurrent requests for the same form wait on the in-flight call instead of
+    issuing their own. Empty mappings (usually LLM failures) are not cached.
+    """
+    key = _autofill_cache_key(url, personal, fields)
+    with _AUTOFILL_LOCK:
+        cached = _AUTOFILL_CACHE.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        inflight = _AUTOFILL_INFLIGHT.get(key)
+        owner = inflight is None
+        if owner:
+            inflight = _AUTOFILL_INFLIGHT[key] = Future()
+    if not owner:
+        return inflight.result()
+
+    values: Dict[str, str] = {}
+    try:
+        values = _run_llm_mapping(personal, fields)
+    finally:
+        with _AUTOFILL_LOCK:
+            del _AUTOFILL_INFLIGHT[key]
+            if values:
+                if len(_AUTOFILL_CACHE) >= AUTOFILL_CACHE_MAX_ENTRIES:
+                    _AUTOFILL_CACHE.clear()
+                _AUTOFILL_CACHE[key] = (time.monotonic() + AUTOFILL_CACHE_TTL_SECONDS, values)
+        inflight.set_result(values)
+    return values
+
+
+# Sync handlers: FastAPI runs them on the worker pool, so DB reads and the LLM call
+# do not block the event loop.
 @router.post("/autofill", response_model=AutofillResponse)
-async def autofill(payload: AutofillRequest) -> AutofillResponse:
+def autofill(payload: AutofillRequest) -> AutofillResponse:
     from logging import getLogger
     logger = getLogger(__name__)
     logger.debug(
@@ -167,7 +235,7 @@ async def autofill(payload: AutofillRequest) -> AutofillResponse:
     if not personal:
         return AutofillResponse(skip=True, assignments=[])
 
-    values = _run_llm_mapping(personal, payload.fields)
+    values = _cached_llm_mapping(payload.url, personal, payload.fields)
     logger.debug("Autofill response assignments: %s", values)
     assignments: List[Assignment] = [
         Assignment(field_id=field_id, value=value) for field_id, value in values.items() if value
@@ -176,7 +244,7 @@ async def autofill(payload: AutofillRequest) -> AutofillResponse:
 
 
 @router.post("/resume")
-async def fetch_resume_file(payload: AutofillRequest):
+def fetch_resume_file(payload: AutofillRequest):
     """Return the preferred/ latest/ master resume PDF for the inferred job or fallback to master."""
     job_record = _match_job_by_url(payload.url)
     db_path = get_database_path()
@@ -191,8 +259,6 @@ async def fetch_resume_file(payload: AutofillRequest):
                 pdf_path = Path(version["pdf_path"])
         if pdf_path.name == "resume.pdf":
             # try latest version for this job_id
-            from ..sql import fetch_resume_versions
-
             versions = fetch_resume_versions(db_path, job_record.get("job_id") or job_record.get("id"), limit=1)
             if versions:
                 ver = versions[0]
@@ -55,6 +55,7 @@ class JobListResponse(BaseModel):
     page_size: int
     total: int
     jobs: List[JobSummary]
+    next_cursor: Optional[str] = None
 
 
 class JobDetail(BaseModel):
@@ -2,12 +2,28 @@
 
 from __future__ import annotations
 
+import re
 import sqlite3
+import threading
 from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Mapping
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Mapping
 
-DDL = """
+
+def _url_host_sql(column: str) -> str:
+    """SQL for the lower-cased ``urlparse(...).netloc`` of an http(s) URL column.
+
+    Built from core string functions so the generated host columns stay valid for
+    every writer, not only connections that registered a Python function.
+    """
+    rest = f"substr({column}, instr({column}, '://') + 3)"
+    host_end = f"instr(replace(replace({rest}, '?', '/'), '#', '/') || '/', '/')"
+    host = f"lower(substr({rest}, 1, {host_end} - 1))"
+    return f"CASE WHEN instr({column}, '://') > 0 THEN {host} END"
+
+
+DDL = f"""
 CREATE TABLE IF NOT EXISTS job_postings (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     job_id TEXT,
@@ -19,16 +35,74 @@ CREATE TABLE IF NOT EXISTS job_postings (
     salary_min REAL,
     salary_max REAL,
     description TEXT NOT NULL,
-    url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
     apply_url TEXT,
     preferred_resume_version_id TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    url_host TEXT GENERATED ALWAYS AS ({_url_host_sql('url')}) VIRTUAL,
+    apply_url_host TEXT GENERATED ALWAYS AS ({_url_host_sql('apply_url')}) VIRTUAL
 );
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_job_postings_job_id
     ON job_postings(job_id)
     WHERE job_id IS NOT NULL;
 
+-- Single-column indexes end in the rowid (jp.id), matching the list's tie-break, so
+-- keyset pages sorted by title/company are an index seek with no sort step.
+CREATE INDEX IF NOT EXISTS idx_job_postings_title ON job_postings(title);
+CREATE INDEX IF NOT EXISTS idx_job_postings_company ON job_postings(company);
+
+-- Trigram index over job_postings (external content), so substring LIKE searches on
+-- title/company are index lookups rather than a scan of every row.
+CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5(
+    title, company, content='job_postings', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_fts_insert AFTER INSERT ON job_postings
+BEGIN
+    INSERT INTO job_postings_fts (rowid, title, company)
+    VALUES (new.id, new.title, new.company);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_fts_delete AFTER DELETE ON job_postings
+BEGIN
+    INSERT INTO job_postings_fts (job_postings_fts, rowid, title, company)
+    VALUES ('delete', old.id, old.title, old.company);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_fts_update
+AFTER UPDATE OF title, company ON job_postings
+BEGIN
+    INSERT INTO job_postings_fts (job_postings_fts, rowid, title, company)
+    VALUES ('delete', old.id, old.title, old.company);
+    INSERT INTO job_postings_fts (rowid, title, company)
+    VALUES (new.id, new.title, new.company);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO meta (key, value) VALUES ('jobs_version', 0);
+
+-- Bumped by every writer (including the scraper) so cached job counts can be revalidated.
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_insert_version AFTER INSERT ON job_postings
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'jobs_version';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_delete_version AFTER DELETE ON job_postings
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'jobs_version';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_job_postings_update_version
+AFTER UPDATE OF title, company, posting_time ON job_postings
+BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'jobs_version';
+END;
+
 CREATE TABLE IF NOT EXISTS scores (
     job_id TEXT PRIMARY KEY,
     score REAL,
@@ -36,6 +110,13 @@ CREATE TABLE IF NOT EXISTS scores (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS llm_score_cache (
+    cache_key TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    refined_score REAL NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS job_embeddings (
     job_id TEXT NOT NULL,
     model_name TEXT NOT NULL,
@@ -47,6 +128,7 @@ CREATE TABLE IF NOT EXISTS job_embeddings (
 CREATE TABLE IF NOT EXISTS resume_embeddings (
     resume_path TEXT NOT NULL,
     model_name TEXT NOT NULL,
+    content_hash TEXT,
     embedding BLOB NOT NULL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (resume_path, model_name)
@@ -85,94 +167,300 @@ CREATE TABLE IF NOT EXISTS resume_versions (
 );
 """
 
+# Applied to every connection: synchronous/temp_store/cache_size are per-handle settings.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+STATEMENT_CACHE_SIZE = 256
+
+
+def _connect(database_path: Path, **kwargs: Any) -> sqlite3.Connection:
+    """Open a connection with the tuned per-connection PRAGMAs applied."""
+    kwargs.setdefault("cached_statements", STATEMENT_CACHE_SIZE)
+    conn = sqlite3.connect(database_path, **kwargs)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def open_connection(database_path: Path) -> sqlite3.Connection:
+    """Open a long-lived connection for callers that write repeatedly; caller closes it.
+
+    The connection is in autocommit mode (``isolation_level=None``); batch writers
+    issue their own ``BEGIN``/``COMMIT`` instead of Python's implicit transactions.
+    """
+    return _connect(database_path, check_same_thread=False, isolation_level=None)
+
+
+_READERS = threading.local()
+
+
+def _read_connection(database_path: Path) -> sqlite3.Connection:
+    """Return this thread's long-lived read connection to ``database_path``.
+
+    Server reads run on a fixed worker-thread pool, so one connection per thread
+    skips the connect, PRAGMAs and schema parse a fresh connection pays per request.
+    Autocommit mode means every statement reads the latest committed WAL snapshot.
+    """
+    connections = getattr(_READERS, "connections", None)
+    if connections is None:
+        connections = _READERS.connections = {}
+    conn = connections.get(database_path)
+    if conn is None:
+        conn = _connect(database_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        connections[database_path] = conn
+    return conn
+
 
 def ensure_schema(database_path: Path) -> None:
     """Create the jobs table and supporting indexes if they do not exist."""
     database_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
+        # WAL persists in the database file, so setting it once at schema time suffices.
+        if Path(database_path).name != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        has_search_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_postings_fts'"
+        ).fetchone()
         conn.executescript(DDL)
+        if not has_search_index:
+            # Triggers only cover new writes; index the rows that predate the table.
+            conn.execute("INSERT INTO job_postings_fts (job_postings_fts) VALUES ('rebuild')")
         _add_column_if_missing(conn, "job_postings", "posting_time", "TEXT")
         _add_column_if_missing(conn, "job_postings", "apply_url", "TEXT")
         _add_column_if_missing(conn, "job_postings", "preferred_resume_version_id", "TEXT")
+        _add_column_if_missing(conn, "resume_embeddings", "content_hash", "TEXT")
+        # Created after the column migration so older databases can build it too.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resume_embeddings_content_hash "
+            "ON resume_embeddings(content_hash, model_name)"
+        )
+        _drop_url_unique_constraint(conn)
+        # Matches the list's "posted within" predicate, which compares datetime(posting_time).
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_job_postings_posted "
+            "ON job_postings(datetime(posting_time))"
+        )
+        # After the rebuild: INSERT ... SELECT * cannot write generated columns.
+        for column in ("url", "apply_url"):
+            _add_column_if_missing(
+                conn,
+                "job_postings",
+                f"{column}_host",
+                f"TEXT GENERATED ALWAYS AS ({_url_host_sql(column)}) VIRTUAL",
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_job_postings_{column}_host "
+                f"ON job_postings({column}_host)"
+            )
         conn.commit()
 
 
 def _add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
     """Add a column to a table if it does not already exist."""
-    existing = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    # table_xinfo also lists generated columns, which table_info hides.
+    existing = conn.execute(f"PRAGMA table_xinfo({table})").fetchall()
     if any(row[1] == column for row in existing):
         return
     conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
 
 
+_LEGACY_URL_COLUMN = "url TEXT NOT NULL UNIQUE"
+_VIEW_ID_RE = re.compile(r"/view/(\d+)")
+
+
+def _drop_url_unique_constraint(conn: sqlite3.Connection) -> None:
+    """One-time migration: job_id is the natural key, so drop the UNIQUE(url) index.
+
+    Rows missing a job_id get one derived from their ``/jobs/view/<id>`` URL first.
+    The table is rebuilt from its stored definition so added columns are preserved.
+    """
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'job_postings'"
+    ).fetchone()
+    if not row or _LEGACY_URL_COLUMN not in row[0]:
+        return
+
+    missing = conn.execute(
+        "SELECT id, url FROM job_postings WHERE job_id IS NULL"
+    ).fetchall()
+    for row_id, url in missing:
+        match = _VIEW_ID_RE.search(url or "")
+        if match:
+            conn.execute(
+                "UPDATE OR IGNORE job_postings SET job_id = ? WHERE id = ?",
+                (match.group(1), row_id),
+            )
+
+    rebuilt_sql = (
+        row[0]
+        .replace(_LEGACY_URL_COLUMN, "url TEXT NOT NULL")
+        .replace("job_postings", "job_postings_rebuild", 1)
+    )
+    conn.execute(rebuilt_sql)
+    conn.execute("INSERT INTO job_postings_rebuild SELECT * FROM job_postings")
+    conn.execute("DROP TABLE job_postings")
+    conn.execute("ALTER TABLE job_postings_rebuild RENAME TO job_postings")
+    # Recreates idx_job_postings_job_id, which was dropped with the old table.
+    conn.executescript(DDL)
+
+
+# Column order for positional job rows passed to insert_jobs().
+JOB_COLUMNS: Tuple[str, ...] = (
+    "job_id",
+    "title",
+    "company",
+    "company_url",
+    "recruiter_url",
+    "posting_time",
+    "salary_min",
+    "salary_max",
+    "description",
+    "url",
+    "apply_url",
+)
+# Built once at import; SQLite's statement cache then reuses the compiled program.
+# Target the partial job_id index directly; it is the only uniqueness check on insert.
+_ON_JOB_ID_CONFLICT = " ON CONFLICT(job_id) WHERE job_id IS NOT NULL DO NOTHING"
+_INSERT_JOB_SQL = (
+    f"INSERT INTO job_postings ({', '.join(JOB_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + column for column in JOB_COLUMNS)})"
+    + _ON_JOB_ID_CONFLICT
+)
+_ROW_PLACEHOLDERS = f"({', '.join('?' for _ in JOB_COLUMNS)})"
+# Keep multi-row inserts under SQLite's conservative 999 bound-parameter limit.
+MAX_ROWS_PER_INSERT = 999 // len(JOB_COLUMNS)
+
+
+@lru_cache(maxsize=64)
+def _multi_row_insert_sql(row_count: int) -> str:
+    # Identical SQL text per batch size lets the connection's statement cache hit.
+    return (
+        f"INSERT INTO job_postings ({', '.join(JOB_COLUMNS)}) VALUES "
+        + ", ".join([_ROW_PLACEHOLDERS] * row_count)
+        + _ON_JOB_ID_CONFLICT
+        + " RETURNING job_id"
+    )
+
+
 def insert_job(database_path: Path, job: Mapping[str, Any]) -> bool:
     """Insert a job posting. Returns True if inserted, False if existed."""
-    with sqlite3.connect(database_path) as conn:
-        cursor = conn.execute(
-            """
-            INSERT OR IGNORE INTO job_postings (
-                job_id,
-                title,
-                company,
-                company_url,
-                recruiter_url,
-                posting_time,
-                salary_min,
-                salary_max,
-                description,
-                url,
-                apply_url
-            )
-            VALUES (
-                :job_id,
-                :title,
-                :company,
-                :company_url,
-                :recruiter_url,
-                :posting_time,
-                :salary_min,
-                :salary_max,
-                :description,
-                :url,
-                :apply_url
-            )
-            """,
-            job,
-        )
+    with _connect(database_path) as conn:
+        cursor = conn.execute(_INSERT_JOB_SQL, job)
         conn.commit()
         return cursor.rowcount > 0
 
 
+def insert_jobs(conn: sqlite3.Connection, rows: Sequence[Sequence[Any]]) -> Set[str]:
+    """Insert positional job rows (``JOB_COLUMNS`` order) in a single transaction.
+
+    Uses multi-row ``VALUES`` with ``RETURNING`` so the newly inserted job_ids come
+    back from the insert itself. Returns those job_ids.
+    """
+    inserted: Set[str] = set()
+    if not rows:
+        return inserted
+    with conn:
+        conn.execute("BEGIN")
+        for start in range(0, len(rows), MAX_ROWS_PER_INSERT):
+            batch = rows[start : start + MAX_ROWS_PER_INSERT]
+            params = [value for row in batch for value in row]
+            cursor = conn.execute(_multi_row_insert_sql(len(batch)), params)
+            inserted.update(found[0] for found in cursor if found[0])
+    return inserted
+
+
+def fetch_known_job_ids(conn: sqlite3.Connection) -> Set[str]:
+    """Return every stored job_id (served from the job_id index)."""
+    rows = conn.execute("SELECT job_id FROM job_postings WHERE job_id IS NOT NULL")
+    return {row[0] for row in rows}
+
+
 def insert_job_dataclass(database_path: Path, job) -> bool:
     """Helper that accepts a dataclass instance."""
     return insert_job(database_path, asdict(job))
 
 
+_UPSERT_SCORE_SQL = """
+INSERT INTO scores (job_id, score, llm_refined_score)
+VALUES (?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    score=excluded.score,
+    llm_refined_score=COALESCE(
+        excluded.llm_refined_score,
+        llm_refined_score
+    ),
+    updated_at=CURRENT_TIMESTAMP
+"""
+
+
 def upsert_score(
     database_path: Path, job_id: str, score: float, llm_refined_score: float | None
 ) -> None:
     """Insert or update a job similarity score."""
-    with sqlite3.connect(database_path) as conn:
-        conn.execute(
+    with _connect(database_path) as conn:
+        conn.execute(_UPSERT_SCORE_SQL, (job_id, score, llm_refined_score))
+        conn.commit()
+
+
+def upsert_scores(
+    database_path: Path, rows: Iterable[Tuple[str, float, Optional[float]]]
+) -> None:
+    """Insert or update many (job_id, score, llm_refined_score) rows in one transaction."""
+    with _connect(database_path) as conn:
+        conn.executemany(_UPSERT_SCORE_SQL, rows)
+        conn.commit()
+
+
+def fetch_cached_refinements(
+    database_path: Path, cache_keys: Iterable[str]
+) -> Dict[str, float]:
+    """Return previously stored LLM refined scores keyed by cache key."""
+    cache_keys = list(cache_keys)
+    if not cache_keys:
+        return {}
+
+    placeholders = ",".join("?" for _ in cache_keys)
+    with _connect(database_path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT cache_key, refined_score
+            FROM llm_score_cache
+            WHERE cache_key IN ({placeholders})
+            """,
+            cache_keys,
+        ).fetchall()
+
+    return {row[0]: row[1] for row in rows}
+
+
+def store_refinements(
+    database_path: Path, rows: Iterable[Tuple[str, str, float]]
+) -> None:
+    """Cache (cache_key, job_id, refined_score) rows from an LLM refinement."""
+    with _connect(database_path) as conn:
+        conn.executemany(
             """
-            INSERT INTO scores (job_id, score, llm_refined_score)
+            INSERT INTO llm_score_cache (cache_key, job_id, refined_score)
             VALUES (?, ?, ?)
-            ON CONFLICT(job_id) DO UPDATE SET
-                score=excluded.score,
-                llm_refined_score=COALESCE(
-                    excluded.llm_refined_score,
-                    llm_refined_score
-                ),
+            ON CONFLICT(cache_key) DO UPDATE SET
+                refined_score=excluded.refined_score,
                 updated_at=CURRENT_TIMESTAMP
             """,
-            (job_id, score, llm_refined_score),
+            rows,
         )
         conn.commit()
 
 
 def fetch_job_descriptions(database_path: Path) -> List[Tuple[str, str]]:
     """Return (job_id, description) rows from job_postings."""
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         rows = conn.execute(
             """
             SELECT job_id, description
@@ -196,7 +484,7 @@ def fetch_job_embeddings(
     placeholders = ",".join("?" for _ in job_ids)
     params: Tuple[Any, ...] = (model_name, *job_ids)
 
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         rows = conn.execute(
             f"""
             SELECT job_id, embedding
@@ -210,78 +498,99 @@ def fetch_job_embeddings(
     return {row[0]: row[1] for row in rows}
 
 
+_UPSERT_JOB_EMBEDDING_SQL = """
+INSERT INTO job_embeddings (job_id, model_name, embedding)
+VALUES (?, ?, ?)
+ON CONFLICT(job_id, model_name) DO UPDATE SET
+    embedding=excluded.embedding,
+    updated_at=CURRENT_TIMESTAMP
+"""
+
+
 def upsert_job_embedding(
     database_path: Path, job_id: str, model_name: str, embedding: bytes
 ) -> None:
     """Store a job embedding for the given model."""
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.execute(
-            """
-            INSERT INTO job_embeddings (job_id, model_name, embedding)
-            VALUES (?, ?, ?)
-            ON CONFLICT(job_id, model_name) DO UPDATE SET
-                embedding=excluded.embedding,
-                updated_at=CURRENT_TIMESTAMP
-            """,
-            (job_id, model_name, sqlite3.Binary(embedding)),
+            _UPSERT_JOB_EMBEDDING_SQL, (job_id, model_name, sqlite3.Binary(embedding))
+        )
+        conn.commit()
+
+
+def upsert_job_embeddings(
+    database_path: Path, model_name: str, rows: Iterable[Tuple[str, bytes]]
+) -> None:
+    """Store many (job_id, embedding) pairs for one model in a single transaction."""
+    with _connect(database_path) as conn:
+        conn.executemany(
+            _UPSERT_JOB_EMBEDDING_SQL,
+            (
+                (job_id, model_name, sqlite3.Binary(embedding))
+                for job_id, embedding in rows
+            ),
         )
         conn.commit()
 
 
 def fetch_resume_embedding(
-    database_path: Path, resume_path: Path, model_name: str
+    database_path: Path, content_hash: str, model_name: str
 ) -> Optional[bytes]:
-    """Retrieve the stored embedding for the resume if present."""
-    with sqlite3.connect(database_path) as conn:
+    """Retrieve a stored embedding for resume text with this content hash, if any."""
+    with _connect(database_path) as conn:
         row = conn.execute(
             """
             SELECT embedding
             FROM resume_embeddings
-            WHERE resume_path = ?
+            WHERE content_hash = ?
               AND model_name = ?
+            LIMIT 1
             """,
-            (str(resume_path), model_name),
+            (content_hash, model_name),
         ).fetchone()
     return row[0] if row else None
 
 
 def upsert_resume_embedding(
-    database_path: Path, resume_path: Path, model_name: str, embedding: bytes
+    database_path: Path,
+    resume_path: Path,
+    content_hash: str,
+    model_name: str,
+    embedding: bytes,
 ) -> None:
-    """Persist the resume embedding for reuse."""
-    with sqlite3.connect(database_path) as conn:
+    """Persist the resume embedding for reuse, tagged with the text's content hash."""
+    with _connect(database_path) as conn:
         conn.execute(
             """
-            INSERT INTO resume_embeddings (resume_path, model_name, embedding)
-            VALUES (?, ?, ?)
+            INSERT INTO resume_embeddings (resume_path, model_name, content_hash, embedding)
+            VALUES (?, ?, ?, ?)
             ON CONFLICT(resume_path, model_name) DO UPDATE SET
+                content_hash=excluded.content_hash,
                 embedding=excluded.embedding,
                 updated_at=CURRENT_TIMESTAMP
             """,
-            (str(resume_path), model_name, sqlite3.Binary(embedding)),
+            (str(resume_path), model_name, content_hash, sqlite3.Binary(embedding)),
         )
         conn.commit()
 
 
-def fetch_jobs_with_scores(
-    database_path: Path,
-    page: int,
-    page_size: int,
-    sort_by: str,
-    order: str,
-    search: Optional[str],
-    posted_within_days: Optional[int] = None,
-) -> Tuple[List[Dict[str, Any]], int]:
-    """Return paginated job postings joined with similarity scores."""
+# CAST(score AS TEXT) only contains these (plus LIKE wildcards may match anything), so
+# searches with any other character cannot match a score and skip that per-row test.
+_SCORE_SEARCH_RE = re.compile(r"[0-9.eE+\-%_]+")
+# The trigram index needs three literal characters in a row; shorter terms scan anyway,
+# and a plain LIKE scan is cheaper than scanning the index.
+_INDEXED_SEARCH_RE = re.compile(r"[^%_]{3}")
 
-    sort_column_map = {
-        "score": "s.score",
-        "llm_refined_score": "s.llm_refined_score",
-        "title": "jp.title",
-        "company": "jp.company",
-    }
-    sort_column = sort_column_map.get(sort_by, "s.score")
-    sort_direction = "DESC" if order.lower() == "desc" else "ASC"
+_JOBS_FROM_SQL = """
+        FROM job_postings AS jp
+        LEFT JOIN scores AS s ON s.job_id = jp.job_id
+"""
+
+
+def _job_filter_sql(
+    search: Optional[str], posted_within_days: Optional[int]
+) -> Tuple[List[str], List[Any]]:
+    """Return the WHERE clauses and parameters shared by the job list and its count."""
 
     where_clauses: List[str] = []
     params: List[Any] = []
@@ -290,10 +599,19 @@ def fetch_jobs_with_scores(
         trimmed = search.strip()
         if trimmed:
             pattern = f"%{trimmed}%"
-            where_clauses.append(
-                "(jp.title LIKE ? OR jp.company LIKE ? OR CAST(s.score AS TEXT) LIKE ?)"
-            )
-            params.extend([pattern, pattern, pattern])
+            if _INDEXED_SEARCH_RE.search(trimmed):
+                # Separate lookups per column: FTS5 cannot serve an OR of LIKEs from the index.
+                text_match = (
+                    "jp.id IN (SELECT rowid FROM job_postings_fts WHERE title LIKE ? "
+                    "UNION SELECT rowid FROM job_postings_fts WHERE company LIKE ?)"
+                )
+            else:
+                text_match = "jp.title LIKE ? OR jp.company LIKE ?"
+            params.extend([pattern, pattern])
+            if _SCORE_SEARCH_RE.fullmatch(trimmed):
+                text_match += " OR CAST(s.score AS TEXT) LIKE ?"
+                params.append(pattern)
+            where_clauses.append(f"({text_match})")
 
     if posted_within_days is not None:
         where_clauses.append(
@@ -301,46 +619,95 @@ def fetch_jobs_with_scores(
         )
         params.append(f"-{posted_within_days} days")
 
+    return where_clauses, params
+
+
+def fetch_jobs_version(database_path: Path) -> int:
+    """Return the job_postings change counter maintained by the ``meta`` triggers."""
+
+    row = _read_connection(database_path).execute(
+        "SELECT value FROM meta WHERE key = 'jobs_version'"
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def count_jobs(
+    database_path: Path, search: Optional[str], posted_within_days: Optional[int] = None
+) -> int:
+    """Return how many job postings match the list filters."""
+
+    where_clauses, params = _job_filter_sql(search, posted_within_days)
     where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-    offset = (page - 1) * page_size
+    count_row = _read_connection(database_path).execute(
+        f"SELECT COUNT(*) {_JOBS_FROM_SQL} {where_sql}", params
+    ).fetchone()
+    return int(count_row[0]) if count_row else 0
 
-    base_query = """
-        FROM job_postings AS jp
-        LEFT JOIN scores AS s ON s.job_id = jp.job_id
+
+def fetch_jobs_page(
+    database_path: Path,
+    page: int,
+    page_size: int,
+    sort_by: str,
+    order: str,
+    search: Optional[str],
+    posted_within_days: Optional[int] = None,
+    after: Optional[Tuple[Any, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, int]]]:
+    """Return one page of job postings joined with similarity scores.
+
+    Pages are ordered by the sort column with ``jp.id`` as tie-break. Passing the
+    ``(sort value, id)`` of the previous page's last row as ``after`` seeks past it
+    instead of using ``OFFSET``, so deep pages cost the same as the first. The second
+    return value is that key for the returned page, or None when it is the last.
     """
 
-    with sqlite3.connect(database_path) as conn:
-        conn.row_factory = sqlite3.Row
-        count_row = conn.execute(
-            f"SELECT COUNT(*) {base_query} {where_sql}", params
-        ).fetchone()
-        total_count = int(count_row[0]) if count_row else 0
+    sort_column_map = {
+        "score": "s.score",
+        "llm_refined_score": "s.llm_refined_score",
+        "title": "jp.title",
+        "company": "jp.company",
+    }
+    if sort_by not in sort_column_map:
+        sort_by = "score"
+    sort_column = sort_column_map[sort_by]
+    descending = order.lower() == "desc"
+    sort_direction = "DESC" if descending else "ASC"
 
-        rows = conn.execute(
-            f"""
-            SELECT
-                jp.id,
-                jp.job_id,
-                jp.title,
-                jp.company,
-                jp.company_url,
-                jp.recruiter_url,
-                jp.posting_time,
-                jp.salary_min,
-                jp.salary_max,
-                jp.url,
-                jp.apply_url,
-                jp.preferred_resume_version_id,
-                s.score,
-                s.llm_refined_score,
-                s.updated_at AS score_updated_at
-            {base_query}
-            {where_sql}
-            ORDER BY {sort_column} {sort_direction}, jp.created_at DESC
-            LIMIT ? OFFSET ?
-            """,
-            (*params, page_size, offset),
-        ).fetchall()
+    where_clauses, params = _job_filter_sql(search, posted_within_days)
+    offset = (page - 1) * page_size
+    if after is not None:
+        keyset_sql, keyset_params = _keyset_clause(sort_column, descending, after)
+        where_clauses.append(keyset_sql)
+        params.extend(keyset_params)
+        offset = 0
+    where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+
+    rows = _read_connection(database_path).execute(
+        f"""
+        SELECT
+            jp.id,
+            jp.job_id,
+            jp.title,
+            jp.company,
+            jp.company_url,
+            jp.recruiter_url,
+            jp.posting_time,
+            jp.salary_min,
+            jp.salary_max,
+            jp.url,
+            jp.apply_url,
+            jp.preferred_resume_version_id,
+            s.score,
+            s.llm_refined_score,
+            s.updated_at AS score_updated_at
+        {_JOBS_FROM_SQL}
+        {where_sql}
+        ORDER BY {sort_column} {sort_direction}, jp.id {sort_direction}
+        LIMIT ? OFFSET ?
+        """,
+        (*params, page_size, offset),
+    ).fetchall()
 
     jobs: List[Dict[str, Any]] = []
     for row in rows:
@@ -364,7 +731,30 @@ def fetch_jobs_with_scores(
             }
         )
 
-    return jobs, total_count
+    next_after = (rows[-1][sort_by], rows[-1]["id"]) if len(rows) == page_size else None
+    return jobs, next_after
+
+
+def _keyset_clause(
+    column: str, descending: bool, after: Tuple[Any, int]
+) -> Tuple[str, List[Any]]:
+    """Build the predicate selecting rows ordered after ``after`` by (column, jp.id).
+
+    SQLite sorts NULLs first ascending and last descending; row-value comparisons
+    never match NULL, so those positions are spelled out explicitly.
+    """
+
+    value, row_id = after
+    if descending:
+        if value is None:
+            return f"({column} IS NULL AND jp.id < ?)", [row_id]
+        return (
+            f"({column} < ? OR {column} IS NULL OR ({column} = ? AND jp.id < ?))",
+            [value, value, row_id],
+        )
+    if value is None:
+        return f"({column} IS NOT NULL OR jp.id > ?)", [row_id]
+    return f"({column} > ? OR ({column} = ? AND jp.id > ?))", [value, value, row_id]
 
 
 def fetch_job_with_score(database_path: Path, job_key: str) -> Optional[Dict[str, Any]]:
@@ -398,14 +788,11 @@ def fetch_job_with_score(database_path: Path, job_key: str) -> Optional[Dict[str
         LIMIT 1
     """
 
-    with sqlite3.connect(database_path) as conn:
-        conn.row_factory = sqlite3.Row
-        row = conn.execute(query.format(where_clause=where_clause), params).fetchone()
+    conn = _read_connection(database_path)
+    row = conn.execute(query.format(where_clause=where_clause), params).fetchone()
 
-        if not row and job_key.isdigit():
-            row = conn.execute(
-                query.format(where_clause="jp.id = ?"), (int(job_key),)
-            ).fetchone()
+    if not row and job_key.isdigit():
+        row = conn.execute(query.format(where_clause="jp.id = ?"), (int(job_key),)).fetchone()
 
     if not row:
         return None
@@ -430,11 +817,33 @@ def fetch_job_with_score(database_path: Path, job_key: str) -> Optional[Dict[str
     }
 
 
+def fetch_job_by_host(database_path: Path, hosts: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Return the oldest job whose apply_url or url host is one of ``hosts``.
+
+    Both lookups are seeks on the indexed generated host columns.
+    """
+
+    if not hosts:
+        return None
+    placeholders = ", ".join("?" for _ in hosts)
+    row = _read_connection(database_path).execute(
+        f"""
+        SELECT id, job_id, url, apply_url, preferred_resume_version_id
+        FROM job_postings
+        WHERE apply_url_host IN ({placeholders}) OR url_host IN ({placeholders})
+        ORDER BY id
+        LIMIT 1
+        """,
+        (*hosts, *hosts),
+    ).fetchone()
+    return dict(row) if row else None
+
+
 def set_preferred_resume_version(
     database_path: Path, job_key: str, version_id: Optional[str]
 ) -> None:
     """Set the preferred resume version for a job (job_id or numeric id)."""
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         updated = conn.execute(
             """
             UPDATE job_postings
@@ -465,7 +874,7 @@ def insert_fit_analysis(
     summary: str,
     instructions: Optional[str],
 ) -> Dict[str, Any]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.execute(
             """
             INSERT INTO job_fit_analyses (job_key, job_id, score, summary, instructions)
@@ -481,7 +890,7 @@ def insert_fit_analysis(
 def fetch_latest_fit_analysis(
     database_path: Path, job_key: str
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         row = conn.execute(
             """
@@ -508,7 +917,7 @@ def insert_outreach_message(
     linkedin_text: str,
     instructions: Optional[str],
 ) -> Dict[str, Any]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.execute(
             """
             INSERT INTO outreach_messages (job_key, job_id, email_text, linkedin_text, instructions)
@@ -524,7 +933,7 @@ def insert_outreach_message(
 def fetch_latest_outreach_message(
     database_path: Path, job_key: str
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         row = conn.execute(
             """
@@ -554,7 +963,7 @@ def insert_resume_version(
     status: str,
     instructions: Optional[str],
 ) -> Dict[str, Any]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.execute(
             """
             INSERT INTO resume_versions (
@@ -588,7 +997,7 @@ def insert_resume_version(
 def fetch_latest_resume_version(
     database_path: Path, job_key: str
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         row = conn.execute(
             """
@@ -608,7 +1017,7 @@ def fetch_latest_resume_version(
 def fetch_resume_version(
     database_path: Path, version_id: str
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         row = conn.execute(
             """
@@ -628,7 +1037,7 @@ def fetch_resume_versions(
     database_path: Path, job_key: str, limit: int = 20
 ) -> List[Dict[str, Any]]:
     """Return recent resume versions for a job, newest first."""
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             """
@@ -643,9 +1052,41 @@ def fetch_resume_versions(
     return [dict(row) for row in rows]
 
 
+def fetch_agent_records(
+    database_path: Path, job_key: str, version_limit: int = 20
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Return (recent resume versions, latest outreach message) over one connection.
+
+    The first version is the latest one, so callers need no separate query for it.
+    """
+    with _connect(database_path) as conn:
+        conn.row_factory = sqlite3.Row
+        versions = conn.execute(
+            """
+            SELECT version_id, job_key, job_id, tex_path, pdf_path, page_count, status, instructions, created_at
+            FROM resume_versions
+            WHERE job_key = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (job_key, version_limit),
+        ).fetchall()
+        outreach = conn.execute(
+            """
+            SELECT id, job_key, job_id, email_text, linkedin_text, instructions, created_at
+            FROM outreach_messages
+            WHERE job_key = ?
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            (job_key,),
+        ).fetchone()
+    return [dict(row) for row in versions], dict(outreach) if outreach else None
+
+
 def delete_resume_versions(database_path: Path, job_key: str) -> int:
     """Delete all resume versions for a job, remove files, and clear preferred pointer. Returns rows deleted."""
-    with sqlite3.connect(database_path) as conn:
+    with _connect(database_path) as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             """
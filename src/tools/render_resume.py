@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 import shutil
 import subprocess
 from pathlib import Path
@@ -16,6 +17,16 @@ DEFAULT_CLS = Path("data/rewrite.cls")
 DEFAULT_OUTPUT = Path("data/resume.pdf")
 DEFAULT_ENGINE = "tectonic"
 LOGGER = logging.getLogger(__name__)
+# Set after the first successful compile: the bundle is cached locally from then on,
+# so later runs can skip tectonic's network freshness checks with --only-cached.
+_BUNDLE_WARM = False
+# Output of a cached-only compile that needed a file the local bundle cache lacks.
+# Anything else (bad TeX included) would fail online too, so it is not retried.
+_MISSING_RESOURCE_RE = re.compile(
+    r"File `[^']+' not found|can't find file|not (?:found|available) in (?:the )?cache"
+    r"|only-cached|could not find|no such file",
+    re.IGNORECASE,
+)
 app = typer.Typer(help="Compile the LaTeX resume into a PDF.")
 
 
@@ -57,14 +68,18 @@ def _ensure_engine(engine: str) -> str:
     return resolved
 
 
-def _run_engine(engine: str, tex_path: Path, workdir: Path) -> Path:
+def _run_engine(
+    engine: str, tex_path: Path, workdir: Path, *, only_cached: bool = False
+) -> Path:
     cmd = [
         engine,
         "--keep-intermediates",
         "--outdir",
         ".",
-        tex_path.name,
     ]
+    if only_cached:
+        cmd.append("--only-cached")
+    cmd.append(tex_path.name)
     LOGGER.info("Running %s in %s: %s", engine, workdir, " ".join(cmd))
     proc = subprocess.run(
         cmd,
@@ -87,6 +102,25 @@ def _run_engine(engine: str, tex_path: Path, workdir: Path) -> Path:
     return workdir / f"{tex_path.stem}.pdf"
 
 
+def _run_engine_warm(engine: str, tex_path: Path, workdir: Path) -> Path:
+    """Run the engine offline once the bundle is warm.
+
+    Only a failure caused by a file missing from the local bundle cache is retried
+    with network access; other errors are raised from the first compile.
+    """
+    global _BUNDLE_WARM
+    if _BUNDLE_WARM:
+        try:
+            return _run_engine(engine, tex_path, workdir, only_cached=True)
+        except RuntimeError as exc:
+            if not _MISSING_RESOURCE_RE.search(str(exc)):
+                raise
+            LOGGER.debug("Cached-only compile lacked a bundle file; retrying online: %s", exc)
+    generated_pdf = _run_engine(engine, tex_path, workdir)
+    _BUNDLE_WARM = True
+    return generated_pdf
+
+
 def _clean_aux_files(workdir: Path, tex_stem: str) -> None:
     for ext in (".aux", ".log", ".out", ".toc"):
         candidate = workdir / f"{tex_stem}{ext}"
@@ -118,7 +152,7 @@ def render_resume(
     resolved_engine = _ensure_engine(DEFAULT_ENGINE)
 
     try:
-        generated_pdf = _run_engine(resolved_engine, tex_path, workdir)
+        generated_pdf = _run_engine_warm(resolved_engine, tex_path, workdir)
     finally:
         if copied_cls and copied_cls.exists():
             try: